@@ -0,0 +1,5 @@
+import os
+from .constants import KERNEL_CACHE_PATH
+
+# numba reads the cache folder when it is imported, so set it before any kernel module is imported.
+os.environ.setdefault('NUMBA_CACHE_DIR', KERNEL_CACHE_PATH)
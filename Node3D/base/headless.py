@@ -0,0 +1,268 @@
+from ..vendor.NodeGraphQt import QtCore, NodeGraph, SubGraph, topological_sort_by_up
+from ..vendor.NodeGraphQt.base.model import NodeGraphModel
+from ..vendor.NodeGraphQt.base.commands import DirectUndoStack
+from ..vendor.NodeGraphQt.base.node import set_views_enabled
+from ..constants import COOK_THREAD_COUNT
+from .node import RootNode
+from .node.utils import CookScheduler
+from .node.memory import memory_manager
+from .session import BINARY_SESSION_EXT, read_binary_session, write_binary_session
+import logging
+import json
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class HeadlessTimeLine(QtCore.QObject):
+    """
+    Frame source of the headless graph, replaces the TimeLine widget.
+    """
+
+    frameChanged = QtCore.Signal(int)
+
+    def __init__(self, parent=None):
+        super(HeadlessTimeLine, self).__init__(parent)
+        self.fps = 25
+        self.frame = 0
+
+    def setFps(self, fps):
+        self.fps = fps
+
+    def getFrame(self):
+        return self.frame
+
+    def getTime(self):
+        return float(self.frame) / self.fps
+
+    def setFrame(self, frame):
+        self.frame = frame
+        self.frameChanged.emit(frame)
+
+
+class HeadlessNodeFactory(object):
+    """
+    Node classes of a headless graph, unlike NodeFactory they are not shared with other graphs.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+
+    def register_node(self, node):
+        self.nodes[node.type_] = node
+
+    def create_node_instance(self, node_type=None, alias=None):
+        NodeCls = self.nodes.get(node_type, None)
+        if NodeCls is None:
+            logger.warning('Cannot find node: "%s"', node_type)
+        return NodeCls
+
+
+class HeadlessGraph(QtCore.QObject):
+    """
+    Node graph runtime without the node graph viewer and the main window.
+    It loads the session saved by NodeGraph.save_session and cooks the nodes.
+    The nodes are created without views (see set_views_enabled), so no QApplication is needed.
+    """
+
+    property_changed = QtCore.Signal(object, str, object)
+    port_connected = QtCore.Signal(object, object)
+    port_disconnected = QtCore.Signal(object, object)
+
+    def __init__(self, nodes=None):
+        super(HeadlessGraph, self).__init__()
+        set_views_enabled(False)
+        self._model = NodeGraphModel()
+        self._undo_stack = DirectUndoStack()
+        self._node_factory = HeadlessNodeFactory()
+        self._current_node_space = None
+        self._auto_update = True
+        self._editable = True
+        # same as NodeGraph.session_formats, the formats registered by the main window.
+        self.session_formats = {BINARY_SESSION_EXT: (read_binary_session, write_binary_session)}
+        self.master = self
+        self.timeline = HeadlessTimeLine(self)
+
+        for node in nodes or []:
+            self.register_node(node)
+        self.add_node(RootNode())
+
+    @property
+    def model(self):
+        return self._model
+
+    @property
+    def auto_update(self):
+        return self._auto_update
+
+    def undo_stack(self):
+        return self._undo_stack
+
+    def begin_undo(self, name):
+        pass
+
+    def end_undo(self):
+        pass
+
+    def register_node(self, node):
+        """
+        Register a node class.
+
+        Args:
+            node(AutoNode): node class.
+        """
+
+        if node is not None:
+            self._node_factory.register_node(node)
+
+    def add_node(self, node, pos=None, unique_name=True, attach_view=True):
+        """
+        Add a node into the headless graph.
+
+        Args:
+            node(AutoNode): node object.
+            pos(list[float]): node x,y position.
+            unique_name(bool): not used, node names are kept as saved.
+            attach_view(bool): not used, the headless graph has no scene.
+        """
+
+        wid_types = node.model.__dict__.pop('_TEMP_property_widget_types')
+        prop_attrs = node.model.__dict__.pop('_TEMP_property_attrs')
+
+        if self._model.get_node_common_properties(node.type_) is None:
+            node_attrs = {node.type_: {
+                n: {'widget_type': wt} for n, wt in wid_types.items()
+            }}
+            for pname, pattrs in prop_attrs.items():
+                node_attrs[node.type_][pname].update(pattrs)
+            self._model.set_node_common_properties(node_attrs)
+        node.set_graph(self)
+        node.model._graph_model = self._model
+        node.model.name = node.NODE_NAME
+        if pos:
+            node.model.pos = [float(pos[0]), float(pos[1])]
+        node.update()
+        self._model.nodes[node.id] = node
+        self._model.topology.add_node(node)
+
+    def set_node_space(self, node):
+        if isinstance(node, SubGraph):
+            self._current_node_space = node
+
+    def get_node_space(self):
+        return self._current_node_space
+
+    def root_node(self):
+        return self.get_node_by_id('0' * 13)
+
+    def all_nodes(self):
+        return list(self._model.nodes.values())
+
+    def get_node_by_id(self, node_id=None):
+        return self._model.nodes.get(node_id, None)
+
+    def get_node_by_name(self, name):
+        """
+        Returns the node by its name or path.
+
+        Args:
+            name(str): node name or node path like '/root/SubGraph/Merge'.
+
+        Returns:
+            AutoNode: node object or None.
+        """
+
+        for node in self._model.nodes.values():
+            if node.name() == name or node.path() == name:
+                return node
+        return None
+
+    def get_unique_name(self, name):
+        return name
+
+    def _deserialize(self, data, relative_pos=False, pos=None, set_parent=True, attach_views=False):
+        """
+        Create nodes and connections from the serialized data by NodeGraph._deserialize.
+
+        Args:
+            data(dict): node data.
+            relative_pos(bool): not used, the headless graph has no viewer.
+            pos(list[float]): not used, the headless graph has no viewer.
+            set_parent(bool): set node parent to current node space.
+            attach_views(bool): not used, the headless graph has no scene.
+
+        Returns:
+            list[AutoNode]: list of node instances.
+        """
+
+        return NodeGraph._deserialize(self, data, set_parent=set_parent, attach_views=False)
+
+    def _session_format(self, file_path):
+        return NodeGraph._session_format(self, file_path)
+
+    def load_session(self, file_path):
+        """
+        Load the session file saved by NodeGraph.save_session,
+        the format is looked up in session_formats by the file extension like NodeGraph, JSON by default.
+
+        Args:
+            file_path(str): session file path.
+        """
+
+        file_path = file_path.strip()
+        if not os.path.isfile(file_path):
+            raise IOError('file {} does not exist.'.format(file_path))
+
+        session_format = self._session_format(file_path)
+        if session_format is not None:
+            layout_data = session_format[0](self, file_path)
+        else:
+            with open(file_path) as data_file:
+                layout_data = json.load(data_file)
+
+        self.set_node_space(self.root_node())
+        self._deserialize(layout_data)
+
+    def cook(self, nodes=None, max_workers=COOK_THREAD_COUNT):
+        """
+        Cook the nodes and all their up stream nodes.
+
+        Args:
+            nodes(list[AutoNode]): nodes to cook, cook the whole graph if it is None.
+            max_workers(int): cook thread count.
+
+        Returns:
+            CookScheduler: cook result of the nodes.
+        """
+
+        if nodes:
+            sorted_nodes = topological_sort_by_up(start_nodes=list(nodes))
+        else:
+            root_node = self.root_node()
+            sorted_nodes = topological_sort_by_up(all_nodes=root_node.children())
+        scheduler = CookScheduler(max_workers)
+        scheduler.run(sorted_nodes)
+        memory_manager.collect()
+        return scheduler
+
+    def cook_frames(self, start, end, nodes=None, step=1, max_workers=COOK_THREAD_COUNT):
+        """
+        Cook the nodes frame by frame.
+
+        Args:
+            start(int): start frame.
+            end(int): end frame, included.
+            nodes(list[AutoNode]): nodes to cook, cook the whole graph if it is None.
+            step(int): frame step.
+            max_workers(int): cook thread count.
+
+        Returns:
+            generator: (frame, CookScheduler) of each frame.
+        """
+
+        for frame in range(start, end + 1, step):
+            # nodes depend on time only update their own data, the cook is done below.
+            self._auto_update = False
+            self.timeline.setFrame(frame)
+            self._auto_update = True
+            yield frame, self.cook(nodes, max_workers)
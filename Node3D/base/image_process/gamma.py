@@ -5,7 +5,7 @@ import threading
 from ...constants import cupy
 
 
-@numba.jit(nopython=True, nogil=True, fastmath=True)
+@numba.jit(nopython=True, nogil=True, fastmath=True, cache=True)
 def _pow_thread(data, gamma, start, end):
     for i in range(start, end):
         data[i] = np.power(data[i], gamma)
@@ -31,14 +31,14 @@ def gamma_cpu_thread(img, numthreads, gamma):
     return result.reshape(img.shape)
 
 
-@numba.jit(nopython=True, nogil=True, fastmath=True, parallel=True)
+@numba.jit(nopython=True, nogil=True, fastmath=True, parallel=True, cache=True)
 def _power_parallel(n, m, data, gamma):
     for i in prange(n):
         for j in prange(m):
             data[i, j] = data[i, j] ** gamma
 
 
-@numba.jit(nopython=True, nogil=True, fastmath=True, parallel=True)
+@numba.jit(nopython=True, nogil=True, fastmath=True, parallel=True, cache=True)
 def _power_parallel3(n, m, data, gamma):
     for i in prange(n):
         for j in prange(m):
@@ -47,7 +47,7 @@ def _power_parallel3(n, m, data, gamma):
             data[i, j, 2] = data[i, j, 2] ** gamma
 
 
-@numba.jit(nopython=True, nogil=True, fastmath=True, parallel=True)
+@numba.jit(nopython=True, nogil=True, fastmath=True, parallel=True, cache=True)
 def _power_parallel4(n, m, data, gamma):
     for i in prange(n):
         for j in prange(m):
@@ -75,6 +75,17 @@ def gamma_cpu(data, gamma):
         _power_parallel4(n, m, data, gamma)
 
 
+def warm_up():
+    """
+    Compile the kernels for float images with 1, 3 and 4 channels.
+    """
+
+    for dtype in (np.float32, np.float64):
+        for shape in ((2, 2), (2, 2, 3), (2, 2, 4)):
+            gamma_cpu(np.ones(shape, dtype=dtype), 2.2)
+        gamma_cpu_thread(np.ones((2, 2, 3), dtype=dtype), 1, 2.2)
+
+
 def gamma_gpu(img, gamma):
     gamma = 1.0 / gamma
     img_gpu = cupy.asarray(img)
@@ -4,14 +4,14 @@ import numpy as np
 from ...constants import cupy
 
 
-@numba.jit(nopython=True, nogil=True, fastmath=True, parallel=True)
+@numba.jit(nopython=True, nogil=True, fastmath=True, parallel=True, cache=True)
 def _screen_toonmap(n, m, data, gamma, multiply):
     for i in prange(n):
         for j in prange(m):
             data[i, j] = max(min(((data[i, j] * multiply) ** gamma) * 255, 255), 0)
 
 
-@numba.jit(nopython=True, nogil=True, fastmath=True, parallel=True)
+@numba.jit(nopython=True, nogil=True, fastmath=True, parallel=True, cache=True)
 def _screen_toonmap3(n, m, data, gamma, multiply):
     for i in prange(n):
         for j in prange(m):
@@ -20,7 +20,7 @@ def _screen_toonmap3(n, m, data, gamma, multiply):
             data[i, j, 2] = max(min(((data[i, j, 2] * multiply) ** gamma) * 255, 255), 0)
 
 
-@numba.jit(nopython=True, nogil=True, fastmath=True, parallel=True)
+@numba.jit(nopython=True, nogil=True, fastmath=True, parallel=True, cache=True)
 def _screen_toonmap4(n, m, data, gamma, multiply):
     for i in prange(n):
         for j in prange(m):
@@ -48,6 +48,16 @@ def screen_toonmap_cpu(img, gamma=1.0, multiply=1.0):
     return img.astype(np.uint8)
 
 
+def warm_up():
+    """
+    Compile the kernels for float images with 1, 3 and 4 channels.
+    """
+
+    for dtype in (np.float32, np.float64):
+        for shape in ((2, 2), (2, 2, 3), (2, 2, 4)):
+            screen_toonmap_cpu(np.ones(shape, dtype=dtype))
+
+
 def screen_toonmap_gpu(img, gamma=1.0, multiply=1.0):
     cu_image = cupy.asarray(img)
     if not np.allclose(multiply, 1.0):
@@ -0,0 +1,43 @@
+import importlib
+import threading
+import traceback
+
+# modules of the built-in numba kernels, each module has a warm_up function
+# which calls its kernels with the common dtypes and dimensions.
+KERNEL_MODULES = [
+    'Node3D.base.image_process.gamma',
+    'Node3D.base.image_process.screen_toonmap',
+    'Node3D.opengl.Mesh_utils',
+]
+
+
+def _warm_up(modules):
+    for module_name in modules:
+        try:
+            importlib.import_module(module_name).warm_up()
+        except Exception:
+            print('Cannot warm up the kernels of {}'.format(module_name))
+            traceback.print_exc()
+
+
+def warm_up_kernels(modules=None, background=True):
+    """
+    Compile the built-in kernels, or load them from the kernel cache folder.
+    The first cook using a kernel doesn't wait for it to be compiled.
+
+    Args:
+        modules(list[str]): kernel module names, KERNEL_MODULES by default.
+        background(bool): warm up in a background thread.
+
+    Returns:
+        threading.Thread: the warm up thread, None if not in background.
+    """
+
+    modules = list(KERNEL_MODULES if modules is None else modules)
+    if not background:
+        _warm_up(modules)
+        return None
+    thread = threading.Thread(target=_warm_up, args=(modules,), name='KernelWarmUp')
+    thread.daemon = True
+    thread.start()
+    return thread
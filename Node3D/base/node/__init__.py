@@ -3,6 +3,15 @@ from .geometry_node import GeometryNode
 from .image_node import ImageNode
 from .module_node import ModuleNode
 from .script_node import ScriptNode
+from .wrangle_node import WrangleNode
 from .subgraph_node import SubGraphNode, SubGraphInputNode, \
-    SubGraphOutputNode, RootNode, PublishedNode
+    SubGraphOutputNode, RootNode, PublishedNode, published_templates
 from .utils import update_nodes
+from .cook_worker import CookWorker
+from .trace import tracer
+from .frame_cache import frame_cache
+from .prefetch import FramePrefetcher
+from .memory import memory_manager
+from .disk_cache import disk_cache
+from .session_outputs import session_outputs
+from .kernel_cache import kernel_cache
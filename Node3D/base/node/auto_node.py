@@ -1,7 +1,14 @@
 from ...vendor.NodeGraphQt import BaseNode, Port, QtCore, QtWidgets, QtGui
-from . utils import update_node_down_stream, get_data_type, CryptoColors
+from . utils import update_node_down_stream, get_data_type, CryptoColors, get_cache_key, new_cache_token, \
+    freeze_data, get_data_nbytes
+from .trace import tracer
+from .frame_cache import frame_cache
+from .memory import memory_manager
+from .disk_cache import disk_cache
+from .session_outputs import session_outputs
 import copy
 import time
+import threading
 from ...widgets.parameterTree import DEFAULT_VALUE_MAP, build_curve_ramp, get_ramp_colors, get_ramp_color
 import numpy as np
 import traceback
@@ -12,7 +19,17 @@ class AutoNode(BaseNode, QtCore.QObject):
     cooked = QtCore.Signal()
     param_changed = QtCore.Signal()
     input_changed = QtCore.Signal()
+    _property_queued = QtCore.Signal(str)
     NODE_CATEGORY = NodeCategory.NONE
+    CACHE_ENABLED = True
+    CACHE_IGNORE_PROPERTIES = ('auto_cook',)
+    # nodes never modify their input data in place can set it to True to avoid copying the input data.
+    READ_ONLY_INPUTS = False
+    # expensive nodes can set it to True to keep their cooked outputs on the disk across sessions.
+    DISK_CACHE = False
+    # nodes whose cook only changes their own outputs, and mostly runs without the GIL,
+    # can set it to True to be cooked concurrently with each other by the cook threads.
+    PARALLEL_COOK = False
 
     def __init__(self, defaultInputType=None, defaultOutputType=None):
         super(AutoNode, self).__init__()
@@ -21,6 +38,7 @@ class AutoNode(BaseNode, QtCore.QObject):
         self.matchTypes = [['float', 'int']]
         self.errorColor = (0.784, 0.196, 0.196)
         self.stopCookColor = (0.784, 0.784, 0.784)
+        self.cookingColor = (0.196, 0.588, 0.784)
 
         self.create_property('auto_cook', True)
         self.defaultValue = None
@@ -31,13 +49,41 @@ class AutoNode(BaseNode, QtCore.QObject):
         self._message = ""
         self._message_level = NodeMessageLevel.NONE
         self._params = {}
-
-        # effect
+        self._output_data = {}
+        self._cache_key = None
+        self._time_dependent = False
+        self._evicted = False
+        self._cooking = False
+        self._cook_lock = threading.RLock()
+        self._pending_port_views = {}
+        # frame and slots of the prefetched frame, see AutoNode._frame_slot.
+        self._eval_frame = None
+        self._frame_slots = None
+        self._property_queued.connect(self._apply_queued_property, QtCore.Qt.QueuedConnection)
+
+        # effect, nodes without view (see set_views_enabled) have no effect.
+        self.color_effect = None
+        if self.has_view():
+            self._create_color_effect()
+
+    def _create_color_effect(self):
         self.color_effect = QtWidgets.QGraphicsColorizeEffect()
         self.color_effect.setStrength(0.7)
         self.color_effect.setEnabled(False)
         self.view.setGraphicsEffect(self.color_effect)
 
+    def create_view(self):
+        if self.has_view():
+            return
+        super(AutoNode, self).create_view()
+        self._create_color_effect()
+        [self._update_port_view(port) for port in self.input_ports() + self.output_ports()]
+        self._update_color_effect()
+
+    def release_view(self):
+        super(AutoNode, self).release_view()
+        self.color_effect = None
+
     @property
     def auto_cook(self):
         """
@@ -59,9 +105,14 @@ class AutoNode(BaseNode, QtCore.QObject):
             return
 
         self.model.set_property('auto_cook', mode)
-        self.color_effect.setEnabled(not mode)
-        if not mode:
-            self.color_effect.setColor(QtGui.QColor.fromRgbF(*self.stopCookColor))
+        self._update_color_effect()
+
+    def is_parallel_safe(self):
+        """
+        Returns whether the node can be cooked concurrently with other parallel safe nodes.
+        """
+
+        return self.PARALLEL_COOK
 
     def cook_time(self):
         """
@@ -70,6 +121,52 @@ class AutoNode(BaseNode, QtCore.QObject):
 
         return self._cook_time
 
+    def is_cooking(self):
+        """
+        Returns whether the node is being cooked by the cook worker.
+        """
+
+        return self._cooking
+
+    def set_cooking(self, state):
+        """
+        Set the cooking state of the node, it should be called in the GUI thread.
+        The port views changed during the cook are updated here.
+
+        Args:
+            state(bool): whether the node is being cooked.
+        """
+
+        self._cooking = state
+        if not state:
+            pending, self._pending_port_views = self._pending_port_views, {}
+            [self._update_port_view(port) for port in pending.values()]
+        self._update_color_effect()
+
+    def _in_gui_thread(self):
+        return QtCore.QThread.currentThread() == self.thread()
+
+    def _update_color_effect(self):
+        """
+        Update the node color by the error/cooking/auto_cook state.
+        The view is only changed in the GUI thread.
+        """
+
+        if self.color_effect is None or not self._in_gui_thread():
+            return
+
+        if self._message_level is NodeMessageLevel.ERROR:
+            color = self.errorColor
+        elif self._cooking:
+            color = self.cookingColor
+        elif not self.auto_cook:
+            color = self.stopCookColor
+        else:
+            self.color_effect.setEnabled(False)
+            return
+        self.color_effect.setColor(QtGui.QColor.fromRgbF(*color))
+        self.color_effect.setEnabled(True)
+
     def has_error(self):
         """
         Returns whether the node has errors.
@@ -90,7 +187,263 @@ class AutoNode(BaseNode, QtCore.QObject):
                 return
             if self.graph is not None and not self.graph.auto_update:
                 return
-        update_node_down_stream(self)
+        else:
+            self.clear_cache()
+        cook_worker = getattr(self.graph, 'cook_worker', None)
+        if cook_worker is not None:
+            cook_worker.request([self])
+        else:
+            update_node_down_stream(self)
+
+    def is_cacheable(self):
+        """
+        Returns whether the cooked output of the node can be reused
+        when its properties and inputs are not changed.
+        """
+
+        return self.CACHE_ENABLED
+
+    def cache_key(self):
+        """
+        Returns the key of the current cooked output of the node.
+        Down stream nodes use it to compute their own cache keys.
+        """
+
+        if self.disabled():
+            return get_cache_key('disabled', self._input_cache_keys())
+        return self._cache_key
+
+    def clear_cache(self):
+        """
+        Invalidate the cooked output, the node and all down stream nodes
+        will be cooked next time.
+        """
+
+        self._cache_key = new_cache_token(self)
+        if self._eval_frame is None:
+            frame_cache.remove_node(self)
+
+    def is_time_dependent(self):
+        """
+        Returns whether the node or any of its up stream nodes depends on time,
+        it is updated when the cache key is computed.
+        """
+
+        if self.disabled():
+            return any(self._slot_node(p.node()).is_time_dependent() for _, p in self._upstream_ports())
+        return self._time_dependent
+
+    def _upstream_ports(self):
+        """
+        Returns (input port name, upstream port) of all connected upstream ports.
+        """
+
+        return [(to_port.name(), from_port) for to_port in self.input_ports()
+                for from_port in to_port.connected_ports()]
+
+    def _input_cache_keys(self, upstream_ports=None):
+        """
+        Returns the cache keys of all connected upstream ports.
+        """
+
+        if upstream_ports is None:
+            upstream_ports = self._upstream_ports()
+        return [(name, from_port.name(), self._slot_node(from_port.node()).cache_key())
+                for name, from_port in upstream_ports]
+
+    def compute_cache_key(self):
+        """
+        Hash the node custom properties and the upstream cache keys.
+
+        Returns:
+            str: cache key, None if the node is not cacheable.
+        """
+
+        properties = {name: value for name, value in self.model.custom_properties.items()
+                      if name not in self.CACHE_IGNORE_PROPERTIES}
+        frame = None
+        if properties.get('Depend Time') and self.graph is not None:
+            frame = self._current_frame()
+        upstream_ports = self._upstream_ports()
+        self._time_dependent = frame is not None or \
+            any(self._slot_node(p.node()).is_time_dependent() for _, p in upstream_ports)
+
+        if not self.is_cacheable():
+            return None
+        return get_cache_key(self.type_, properties, frame, self.cache_dependencies(),
+                             self._input_cache_keys(upstream_ports))
+
+    def cache_dependencies(self):
+        """
+        Returns the extra data the cooked output depends on, such as the signature of the loaded files.
+        """
+
+        return None
+
+    def _cook_output(self):
+        """
+        Returns the cooked outputs of the node for the frame cache.
+        """
+
+        return dict(self._output_data)
+
+    def _restore_cook_output(self, data):
+        """
+        Restore the cooked outputs from the frame cache.
+
+        Args:
+            data(object): data returned by AutoNode._cook_output.
+        """
+
+        self._output_data = dict(data)
+
+    def _disk_output(self):
+        """
+        Returns the cooked outputs for the disk cache.
+
+        Returns:
+            (dict, dict): {name: numpy.ndarray} and the JSON serializable info, None if not supported.
+        """
+
+        return None
+
+    def _restore_disk_output(self, arrays, info):
+        """
+        Restore the cooked outputs from the disk cache.
+
+        Args:
+            arrays(dict): {name: numpy.ndarray}.
+            info(dict): data returned by AutoNode._disk_output.
+        """
+
+        pass
+
+    def _restore_cached_output(self, cache_key):
+        """
+        Restore the cooked outputs from the frame cache, the opened session file or the disk cache.
+
+        Args:
+            cache_key(str): current cache key of the node.
+
+        Returns:
+            bool: whether the outputs are restored.
+        """
+
+        if self._time_dependent:
+            data = frame_cache.get(cache_key)
+            if data is not None:
+                self._restore_cook_output(data)
+                return True
+        data = session_outputs.get(cache_key)
+        if data is not None:
+            try:
+                self._restore_disk_output(*data)
+                return True
+            except Exception:
+                session_outputs.remove(cache_key)
+        if self.DISK_CACHE:
+            data = disk_cache.load(cache_key)
+            if data is not None:
+                try:
+                    self._restore_disk_output(*data)
+                    return True
+                except Exception:
+                    disk_cache.remove(cache_key)
+        return False
+
+    def _frame_slot(self, frame, slots):
+        """
+        Returns a copy of the node to cook the frame ahead of the play head.
+        The copy has its own properties, outputs, cache key and message, and reads the outputs of
+        the up stream nodes from their slots, so the node itself is never changed by the prefetch.
+        The cooked outputs are kept by the frame cache under the cache key of the frame.
+
+        Args:
+            frame(int): frame to cook.
+            slots(dict): {node: slot} of the up stream nodes cooked at the same frame.
+
+        Returns:
+            AutoNode.
+        """
+
+        slot = type(self).__new__(type(self))
+        QtCore.QObject.__init__(slot)
+        slot.__dict__.update(self.__dict__)
+        slot.model = copy.copy(self.model)
+        slot.model._custom_prop = dict(self.model._custom_prop)
+        slot.color_effect = None
+        slot._output_data = {}
+        slot._cache_key = None
+        slot._message = ""
+        slot._message_level = NodeMessageLevel.NONE
+        slot._evicted = False
+        slot._cooking = False
+        slot._cook_lock = threading.RLock()
+        slot._pending_port_views = {}
+        slot._eval_frame = frame
+        slot._frame_slots = slots
+        return slot
+
+    def _slot_node(self, node):
+        """
+        Returns the slot of an up stream node at the frame the node is cooked at, or the node itself.
+        """
+
+        if self._frame_slots is None:
+            return node
+        return self._frame_slots.get(node, node)
+
+    def _current_frame(self):
+        """
+        Returns the frame the node is cooked at, it is the play head frame unless the node is a frame slot.
+        """
+
+        if self._eval_frame is not None:
+            return self._eval_frame
+        return self.graph.master.timeline.getFrame()
+
+    def output_nbytes(self):
+        """
+        Returns a rough memory size of the cooked outputs in bytes.
+        """
+
+        return get_data_nbytes(self._output_data)
+
+    def release_output(self):
+        """
+        Release the cooked outputs to save memory, they will be cooked again when they are needed.
+
+        Returns:
+            bool: whether the outputs are released.
+        """
+
+        if self._evicted or not self.is_cacheable() or self.has_error():
+            return False
+        if not self._cook_lock.acquire(False):
+            return False
+        try:
+            self._release_output()
+            self._evicted = True
+        finally:
+            self._cook_lock.release()
+        return True
+
+    def _release_output(self):
+        self._output_data = {}
+
+    def _ensure_output(self):
+        """
+        Cook the node again if its outputs are released by the memory manager.
+        """
+
+        if not self._evicted:
+            return
+        cook_worker = getattr(self.graph, 'cook_worker', None)
+        if cook_worker is not None and self._in_gui_thread():
+            # never cook in the GUI thread beside the worker, the node emits cooked when the worker restores it.
+            cook_worker.request(all_nodes=[self])
+            return
+        self.cook()
 
     def get_data(self, port):
         """
@@ -110,11 +463,70 @@ class AutoNode(BaseNode, QtCore.QObject):
                 max_idx = max(0, len(self.input_ports()) - 1)
                 return self.get_input_data(min(idx, max_idx))
 
+        self._ensure_output()
+        memory_manager.touch(self)
+        if port.name() in self._output_data:
+            return self._output_data[port.name()]
         return self.get_property(port.name())
 
+    def set_output_data(self, name, value):
+        """
+        Set the cooked data of an output port.
+        The data is kept outside the node model, so it is never pushed
+        to the undo stack, compared with the old value or serialized.
+
+        Args:
+            name(str): output port name.
+            value(object): cooked data.
+        """
+
+        self._output_data[name] = value
+        self.set_port_type(name, type(value).__name__)
+
+    def get_output_data(self, name):
+        """
+        Get the cooked data of an output port.
+
+        Args:
+            name(str): output port name.
+
+        Returns:
+            cooked data or None.
+        """
+
+        return self._output_data.get(name, None)
+
+    def output_data(self):
+        """
+        Returns all cooked output data of the node.
+
+        Returns:
+            dict: {port name: cooked data}.
+        """
+
+        return self._output_data
+
+    def legacy_properties(self, node_data):
+        """
+        Old sessions saved the cooked outputs as custom properties named after the output ports,
+        they are dropped so they are never restored into the cache keys.
+
+        Args:
+            node_data(dict): serialized node data.
+
+        Returns:
+            list[str]: property names.
+        """
+
+        ports = set(self.outputs().keys())
+        for port in node_data.get('output_ports', []):
+            ports.add(port['name'] if isinstance(port, dict) else port)
+        return [name for name in node_data.get('custom', {}) if name in ports and not self.has_property(name)]
+
     def get_input_data(self, port):
         """
         Get input data by input port name/index/object.
+        The data is a copy, or a read only view if the node class sets READ_ONLY_INPUTS.
 
         Args:
             port(str/int/Port): input port name/index/object.
@@ -125,15 +537,20 @@ class AutoNode(BaseNode, QtCore.QObject):
         else:
             to_port = port
         if to_port is None:
-            return copy.deepcopy(self.defaultValue)
+            return self._copy_input_data(self.defaultValue)
 
         from_ports = to_port.connected_ports()
         if not from_ports:
-            return copy.deepcopy(self.defaultValue)
+            return self._copy_input_data(self.defaultValue)
 
         for from_port in from_ports:
-            data = from_port.node().get_data(from_port)
-            return copy.deepcopy(data)
+            data = self._slot_node(from_port.node()).get_data(from_port)
+            return self._copy_input_data(data)
+
+    def _copy_input_data(self, data):
+        if self.READ_ONLY_INPUTS:
+            return freeze_data(data)
+        return copy.deepcopy(data)
 
     def cook(self):
         """
@@ -141,26 +558,58 @@ class AutoNode(BaseNode, QtCore.QObject):
         Most time we need to call this method instead of AutoNode.run'.
         """
 
-        _tmp = self.auto_cook
-        self.model.set_property('auto_cook', False)
+        with self._cook_lock:
+            _trace_start = tracer.begin()
 
-        self._close_message()
+            cache_key = self.compute_cache_key()
+            if cache_key is not None and cache_key == self._cache_key and not self._evicted:
+                tracer.end(self, _trace_start, cached=True)
+                return
 
-        _start_time = time.time()
+            if cache_key is not None and self._restore_cached_output(cache_key):
+                self._close_message()
+                self._cache_key = cache_key
+                self._evicted = False
+                if self._eval_frame is None:
+                    memory_manager.update(self)
+                tracer.end(self, _trace_start, cached=True)
+                if self._eval_frame is None:
+                    self.cooked.emit()
+                return
 
-        try:
-            self.run()
-        except:
-            self.error(traceback.format_exc())
+            _tmp = self.auto_cook
+            self.model.set_property('auto_cook', False)
 
-        self.model.set_property('auto_cook', _tmp)
+            self._close_message()
+            self._evicted = False
 
-        if self._message_level is NodeMessageLevel.ERROR:
-            return
+            _start_time = time.perf_counter()
 
-        self._cook_time = time.time() - _start_time
+            try:
+                self.run()
+            except:
+                self.error(traceback.format_exc())
 
-        self.cooked.emit()
+            self.model.set_property('auto_cook', _tmp)
+            tracer.end(self, _trace_start)
+
+            if self._message_level is NodeMessageLevel.ERROR:
+                self.clear_cache()
+                return
+
+            self._cook_time = time.perf_counter() - _start_time
+            self._cache_key = self.compute_cache_key() or new_cache_token(self)
+            if self._eval_frame is None:
+                memory_manager.update(self)
+            if self._time_dependent and self.is_cacheable():
+                frame_cache.put(self, self._cache_key, self._current_frame(), self._cook_output())
+            if self.DISK_CACHE and self.is_cacheable() and self._message_level is NodeMessageLevel.NONE:
+                data = self._disk_output()
+                if data is not None:
+                    disk_cache.save(self._cache_key, *data)
+
+        if self._eval_frame is None:
+            self.cooked.emit()
 
     def run(self):
         """
@@ -169,6 +618,14 @@ class AutoNode(BaseNode, QtCore.QObject):
 
         pass
 
+    def interrupt(self):
+        """
+        Called when the cook of the node is cancelled while it is cooking, maybe from another thread.
+        Nodes which can stop their evaluation early should override it.
+        """
+
+        pass
+
     def on_input_connected(self, to_port, from_port):
         if self.check_port_type(to_port, from_port):
             self.update_stream()
@@ -207,11 +664,47 @@ class AutoNode(BaseNode, QtCore.QObject):
         return True
 
     def set_property(self, name, value):
+        if self._eval_frame is not None:
+            # frame slots only change their own properties.
+            self.model.set_property(name, value)
+            return
+        if self.graph is not None and not self._in_gui_thread():
+            self._set_property_in_cook(name, value)
+            return
         super(AutoNode, self).set_property(name, value)
         self.set_port_type(name, type(value).__name__)
         if name in self.model.custom_properties.keys():
             self.update_stream()
 
+    def _set_property_in_cook(self, name, value):
+        """
+        Set a property from a cook in a worker thread.
+        The model is changed at once so the cook reads the new value,
+        the views are updated later in the GUI thread and the change is not pushed to the undo stack.
+        The node is not cooked again since the property is set by its own cook.
+        """
+
+        try:
+            if self.get_property(name) == value:
+                return
+        except:
+            pass
+        self.model.set_property(name, value)
+        self.set_port_type(name, type(value).__name__)
+        self._property_queued.emit(name)
+
+    def _apply_queued_property(self, name):
+        if self.graph is None:
+            return
+        # later writes of the same cook are queued too, the latest value is applied.
+        value = self.get_property(name)
+        view = self.view
+        if hasattr(view, 'widgets') and name in view.widgets.keys() and view.widgets[name].value != value:
+            view.widgets[name].value = value
+        if name in view.properties.keys():
+            setattr(view, 'xy_pos' if name == 'pos' else name, value)
+        self.graph.property_changed.emit(self, name, value)
+
     def set_port_type(self, port, data_type: str):
         """
         Set the data_type of the port.
@@ -221,6 +714,10 @@ class AutoNode(BaseNode, QtCore.QObject):
             data_type(str): port new data_type.
         """
 
+        if self._eval_frame is not None:
+            # the ports are shared with the node, frame slots leave them unchanged.
+            return
+
         current_port = None
 
         if type(port) is Port:
@@ -239,9 +736,23 @@ class AutoNode(BaseNode, QtCore.QObject):
             else:
                 current_port.data_type = data_type
 
-            current_port.border_color = current_port.color = CryptoColors.get(data_type)
-            conn_type = 'multi' if current_port.multi_connection() else 'single'
-            current_port.view.setToolTip('{}: {} ({}) '.format(current_port.name(), data_type, conn_type))
+            if self._in_gui_thread():
+                self._update_port_view(current_port)
+            else:
+                self._pending_port_views[current_port.name()] = current_port
+
+    def _update_port_view(self, port):
+        """
+        Update the port color and tooltip by its data_type.
+
+        Args:
+            port(Port).
+        """
+
+        data_type = port.data_type
+        port.border_color = port.color = CryptoColors.get(data_type)
+        conn_type = 'multi' if port.multi_connection() else 'single'
+        port.view.setToolTip('{}: {} ({}) '.format(port.name(), data_type, conn_type))
 
     def add_input(self, name='input', data_type='', multi_input=False, display_name=True,
                   color=None, painter_func=None):
@@ -279,9 +790,9 @@ class AutoNode(BaseNode, QtCore.QObject):
         """
 
         if self._message_level is not NodeMessageLevel.NONE:
-            self.color_effect.setEnabled(False)
             self._message = ""
             self._message_level = NodeMessageLevel.NONE
+            self._update_color_effect()
 
     def _set_message(self, message, message_level):
         """
@@ -296,8 +807,7 @@ class AutoNode(BaseNode, QtCore.QObject):
         self._message = str(message)
         self._message_level = message_level
         if message_level is NodeMessageLevel.ERROR:
-            self.color_effect.setEnabled(True)
-            self.color_effect.setColor(QtGui.QColor.fromRgbF(*self.errorColor))
+            self._update_color_effect()
 
     def error(self, message):
         """
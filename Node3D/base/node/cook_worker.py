@@ -0,0 +1,215 @@
+from ...vendor.NodeGraphQt import topological_sort_by_down, QtCore
+from ...vendor.NodeGraphQt.base.utils import get_input_nodes
+from ...constants import COOK_THREAD_COUNT
+from .utils import CookScheduler
+from .memory import memory_manager
+from .subgraph_node import SubGraphNode, SubGraphInputNode, SubGraphOutputNode
+import threading
+
+
+def _prepare_children(nodes):
+    # children of published sub graphs are added into the graph, so they are created in the GUI thread before the cook.
+    [node.prepare_children() for node in nodes if isinstance(node, SubGraphNode)]
+
+
+class _WorkerCookScheduler(CookScheduler):
+    """
+    Cook scheduler which reports the node cook state through the worker signals.
+    """
+
+    def __init__(self, worker, max_workers=1):
+        super(_WorkerCookScheduler, self).__init__(max_workers)
+        self.worker = worker
+
+    def node_started(self, node):
+        self.worker.node_cook_started.emit(node)
+
+    def node_finished(self, node):
+        self.worker.node_cook_finished.emit(node)
+
+
+class _PrefetchScheduler(CookScheduler):
+    """
+    Cook scheduler which cooks the frame slots of the nodes at a frame ahead of the play head.
+    Every cook task gets the slot of its node, which carries the frame, so the nodes are never changed
+    and the cooked outputs are only kept by the frame cache.
+    """
+
+    def __init__(self, frame, max_workers=1):
+        super(_PrefetchScheduler, self).__init__(max_workers)
+        self.frame = frame
+        self.slots = {}
+
+    def run(self, nodes):
+        self.slots = {}
+        for node in nodes:
+            self.slots[node] = node._frame_slot(self.frame, self.slots)
+        super(_PrefetchScheduler, self).run(nodes)
+
+    def _cook(self, node):
+        return super(_PrefetchScheduler, self)._cook(self.slots[node])
+
+
+class CookWorker(QtCore.QObject):
+    """
+    Cook nodes in a background thread.
+    A new request cancels the running cook and is merged with the pending requests,
+    nodes are cooked again by the merged request so nothing is lost.
+    Frames to prefetch are cooked only when there is no pending request.
+    The signals are emitted from the worker thread and received in the GUI thread.
+    """
+
+    node_cook_started = QtCore.Signal(object)
+    node_cook_finished = QtCore.Signal(object)
+    finished = QtCore.Signal(object)
+
+    def __init__(self, parent=None, max_workers=COOK_THREAD_COUNT):
+        super(CookWorker, self).__init__(parent)
+        self.max_workers = max_workers
+        self._condition = threading.Condition()
+        self._start_nodes = []
+        self._all_nodes = []
+        self._scheduler = None
+        self._stopped = False
+        self._prefetch_frames = []
+        self._prefetch_nodes = []
+        self._prefetch_id = 0
+
+        self.node_cook_started.connect(self._on_node_cook_started)
+        self.node_cook_finished.connect(self._on_node_cook_finished)
+
+        self._thread = threading.Thread(target=self._loop, name='CookWorker')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def request(self, start_nodes=None, all_nodes=None):
+        """
+        Request to cook nodes, the running cook will be cancelled.
+
+        Args:
+            start_nodes(list[AutoNode]): cook the nodes and their down stream nodes.
+            all_nodes(list[AutoNode]): cook all the nodes.
+        """
+
+        if start_nodes:
+            _prepare_children(topological_sort_by_down(start_nodes=start_nodes))
+        _prepare_children(all_nodes or [])
+        with self._condition:
+            for node in start_nodes or []:
+                if node not in self._start_nodes:
+                    self._start_nodes.append(node)
+            for node in all_nodes or []:
+                if node not in self._all_nodes:
+                    self._all_nodes.append(node)
+            if self._scheduler is not None:
+                self._scheduler.cancel()
+            self._condition.notify()
+
+    def prefetch(self, frames, nodes):
+        """
+        Set the frames to cook ahead of the play head, the previous frames are replaced.
+        The frames are cooked by copies of the nodes and the outputs are kept by the frame cache,
+        the nodes stay at the current frame.
+
+        Args:
+            frames(list[int]): frames to prefetch, empty list to stop prefetching.
+            nodes(list[AutoNode]): time dependent nodes, their down stream nodes are cooked too.
+        """
+
+        if nodes:
+            _prepare_children(topological_sort_by_down(start_nodes=nodes))
+        with self._condition:
+            self._prefetch_frames = list(frames)
+            self._prefetch_nodes = list(nodes)
+            self._prefetch_id += 1
+            self._condition.notify()
+
+    def is_busy(self):
+        """
+        Returns whether the worker is cooking or has pending requests.
+        """
+
+        with self._condition:
+            return self._scheduler is not None or bool(self._start_nodes or self._all_nodes)
+
+    def stop(self):
+        """
+        Cancel the running cook and stop the worker thread.
+        """
+
+        with self._condition:
+            self._stopped = True
+            if self._scheduler is not None:
+                self._scheduler.cancel()
+            self._condition.notify()
+        self._thread.join()
+
+    def _loop(self):
+        while True:
+            with self._condition:
+                while not self._stopped and not self._start_nodes and not self._all_nodes \
+                        and not self._prefetch_frames:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                if not self._start_nodes and not self._all_nodes:
+                    frame = self._prefetch_frames.pop(0)
+                    nodes, prefetch_id = self._prefetch_nodes, self._prefetch_id
+                    scheduler = _PrefetchScheduler(frame, self.max_workers)
+                    self._scheduler = scheduler
+                else:
+                    frame = None
+
+            if frame is not None:
+                scheduler.run(self._prefetch_order(nodes))
+                with self._condition:
+                    self._scheduler = None
+                    if scheduler.cancelled() and prefetch_id == self._prefetch_id:
+                        self._prefetch_frames.insert(0, frame)
+                continue
+
+            with self._condition:
+                start_nodes, self._start_nodes = self._start_nodes, []
+                all_nodes, self._all_nodes = self._all_nodes, []
+                scheduler = _WorkerCookScheduler(self, self.max_workers)
+                self._scheduler = scheduler
+
+            # nodes already cooked by the first run are skipped by their cache.
+            if all_nodes:
+                scheduler.run(topological_sort_by_down(all_nodes=all_nodes))
+            if start_nodes and not scheduler.cancelled():
+                scheduler.run(topological_sort_by_down(start_nodes=start_nodes))
+
+            with self._condition:
+                self._scheduler = None
+                if scheduler.cancelled():
+                    # cooked nodes are skipped by their cache, so simply request them again.
+                    self._start_nodes.extend(n for n in start_nodes if n not in self._start_nodes)
+                    self._all_nodes.extend(n for n in all_nodes if n not in self._all_nodes)
+                    continue
+            memory_manager.collect()
+            self.finished.emit(scheduler)
+
+    @staticmethod
+    def _prefetch_order(nodes):
+        """
+        Returns the sorted nodes to prefetch.
+        Sub graph nodes cook their children themselves, they and their down stream nodes
+        are left to the play head.
+        """
+
+        skipped = set()
+        result = []
+        for node in topological_sort_by_down(start_nodes=nodes):
+            if isinstance(node, (SubGraphNode, SubGraphInputNode, SubGraphOutputNode)) or \
+                    any(n in skipped for n in get_input_nodes(node)):
+                skipped.add(node)
+            else:
+                result.append(node)
+        return result
+
+    def _on_node_cook_started(self, node):
+        node.set_cooking(True)
+
+    def _on_node_cook_finished(self, node):
+        node.set_cooking(False)
@@ -0,0 +1,159 @@
+from ...constants import DISK_CACHE_PATH, DISK_CACHE_SIZE
+from .utils import json_default
+import numpy as np
+import threading
+import json
+import os
+
+# increase it when the stored format changes, old files are ignored.
+DISK_CACHE_VERSION = 1
+
+
+class DiskCache(object):
+    """
+    Keep the cooked outputs of expensive nodes on the disk across sessions.
+    Outputs are stored by the node cache key as uncompressed npz files,
+    numpy arrays are saved as they are and the other data is saved as a JSON string.
+    Least recently used files are removed when the cache is over its size limit.
+    """
+
+    def __init__(self, path=DISK_CACHE_PATH, max_size=DISK_CACHE_SIZE):
+        self.path = os.path.join(path, 'v{}'.format(DISK_CACHE_VERSION)) if path else ''
+        self.max_size = max_size
+        self._size = None
+        self._lock = threading.Lock()
+
+    def enabled(self):
+        return bool(self.path)
+
+    def _file_path(self, key):
+        return os.path.join(self.path, key[:2], key + '.npz')
+
+    def load(self, key):
+        """
+        Load the outputs.
+
+        Args:
+            key(str): node cache key.
+
+        Returns:
+            (dict, dict): {name: numpy.ndarray} and the JSON info, None if the key is not cached.
+        """
+
+        if not self.path:
+            return None
+        file_path = self._file_path(key)
+        try:
+            with np.load(file_path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files if name != '__info__'}
+                info = json.loads(data['__info__'].tobytes().decode('utf-8'))
+        except (IOError, OSError, ValueError, KeyError):
+            return None
+        try:
+            # the modified time records the last use.
+            os.utime(file_path, None)
+        except OSError:
+            pass
+        return arrays, info
+
+    def save(self, key, arrays, info):
+        """
+        Save the outputs.
+
+        Args:
+            key(str): node cache key.
+            arrays(dict): {name: numpy.ndarray}.
+            info(dict): other data which can be serialized to JSON.
+
+        Returns:
+            bool: whether the outputs are saved.
+        """
+
+        if not self.path:
+            return False
+        try:
+            info = json.dumps(info, default=json_default)
+        except (TypeError, ValueError):
+            return False
+
+        file_path = self._file_path(key)
+        tmp_path = '{}.{}.tmp'.format(file_path, threading.get_ident())
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(tmp_path, 'wb') as file_out:
+                np.savez(file_out, __info__=np.frombuffer(info.encode('utf-8'), dtype=np.uint8), **arrays)
+            os.replace(tmp_path, file_path)
+            size = os.path.getsize(file_path)
+        except (IOError, OSError, ValueError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+        with self._lock:
+            if self._size is not None:
+                self._size += size
+            over = self._size is None or self._size > self.max_size
+        if over:
+            self.cleanup()
+        return True
+
+    def remove(self, key):
+        try:
+            os.remove(self._file_path(key))
+        except OSError:
+            pass
+
+    def _files(self):
+        files = []
+        for root, _, names in os.walk(self.path):
+            for name in names:
+                if not name.endswith('.npz'):
+                    continue
+                file_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, file_path))
+        return files
+
+    def cleanup(self):
+        """
+        Remove the least recently used files until the cache is under its size limit.
+        """
+
+        if not self.path:
+            return
+        with self._lock:
+            files = self._files()
+            size = sum(f[1] for f in files)
+            if size > self.max_size:
+                # leave some space so the next save doesn't clean up again.
+                target = self.max_size * 0.9
+                for _, file_size, file_path in sorted(files):
+                    if size <= target:
+                        break
+                    try:
+                        os.remove(file_path)
+                        size -= file_size
+                    except OSError:
+                        pass
+            self._size = size
+
+    def clear(self):
+        """
+        Remove all cached files.
+        """
+
+        if not self.path:
+            return
+        with self._lock:
+            for _, _, file_path in self._files():
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
+            self._size = 0
+
+
+disk_cache = DiskCache()
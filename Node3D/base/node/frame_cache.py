@@ -0,0 +1,119 @@
+from .utils import get_data_nbytes
+from ...constants import FRAME_CACHE_SIZE
+from collections import OrderedDict
+import threading
+
+
+class FrameCache(object):
+    """
+    LRU cache of the cooked outputs of time dependent nodes and their down stream nodes.
+    Outputs are stored by the node cache key, which contains the frame of the time dependent
+    up stream nodes, so going back to a cooked frame restores the outputs without cooking.
+    Changing parameters or up stream nodes changes the cache key,
+    the outdated outputs are evicted when the cache is over the memory budget.
+    """
+
+    def __init__(self, max_size=FRAME_CACHE_SIZE):
+        self.max_size = max_size
+        # {cache key: (node id, frame, data, size)}
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def size(self):
+        """
+        Returns the memory size of all cached outputs in bytes.
+        """
+
+        return self._size
+
+    def set_max_size(self, max_size):
+        """
+        Set the memory budget, outputs are evicted if the cache is over it.
+
+        Args:
+            max_size(int): bytes.
+        """
+
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def get(self, key):
+        """
+        Get the cached outputs.
+
+        Args:
+            key(str): node cache key.
+
+        Returns:
+            object: cached outputs, None if the key is not cached.
+        """
+
+        with self._lock:
+            item = self._items.get(key, None)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            return item[2]
+
+    def put(self, node, key, frame, data):
+        """
+        Cache the outputs of a node.
+
+        Args:
+            node(AutoNode): cooked node.
+            key(str): node cache key.
+            frame(int): the frame of the outputs.
+            data(object): node outputs.
+        """
+
+        size = get_data_nbytes(data)
+        if size > self.max_size:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= old[3]
+            self._items[key] = (node.id, frame, data, size)
+            self._size += size
+            self._evict()
+
+    def _evict(self):
+        while self._size > self.max_size and self._items:
+            _, item = self._items.popitem(last=False)
+            self._size -= item[3]
+
+    def frames(self, node):
+        """
+        Returns the cached frames of the node.
+
+        Args:
+            node(AutoNode).
+
+        Returns:
+            list[int]: sorted frames.
+        """
+
+        with self._lock:
+            return sorted(set(item[1] for item in self._items.values() if item[0] == node.id))
+
+    def remove_node(self, node):
+        """
+        Remove all cached outputs of the node.
+
+        Args:
+            node(AutoNode).
+        """
+
+        with self._lock:
+            for key in [k for k, item in self._items.items() if item[0] == node.id]:
+                self._size -= self._items.pop(key)[3]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+
+frame_cache = FrameCache()
@@ -1,9 +1,9 @@
 from .auto_node import AutoNode
+from .memory import memory_manager
 from ...opengl import Mesh
 from ...vendor.NodeGraphQt.base.port import Port
 from ...constants import NodeCategory
 import copy
-import gc
 
 
 class GeometryNode(AutoNode):
@@ -20,16 +20,55 @@ class GeometryNode(AutoNode):
 
     @property
     def geo(self):
+        self._ensure_output()
         return self._geo
 
     @geo.setter
     def geo(self, geo):
+        # the old mesh may be still drawn by a viewer and the setter runs in the cook worker,
+        # so it is only dropped and reclaimed by the garbage collector.
         if self._geo is not None:
-            self._geo.clear()
-            del self._geo
-            gc.collect()
+            memory_manager.release(self._geo.getMemorySize())
         self._geo = geo
 
+    def output_nbytes(self):
+        size = super(GeometryNode, self).output_nbytes()
+        if self._geo is not None:
+            size += self._geo.getMemorySize()
+        return size
+
+    def _release_output(self):
+        super(GeometryNode, self)._release_output()
+        # the mesh may be still used by a viewer, so it is not cleared here.
+        self._geo = None
+
+    def _frame_slot(self, frame, slots):
+        slot = super(GeometryNode, self)._frame_slot(frame, slots)
+        slot._geo = None
+        return slot
+
+    def _cook_output(self):
+        data = super(GeometryNode, self)._cook_output()
+        data['geo'] = self.copy_geo(self._geo)
+        return data
+
+    def _restore_cook_output(self, data):
+        super(GeometryNode, self)._restore_cook_output(data)
+        self.geo = self.copy_geo(data.get('geo', None))
+
+    def _disk_output(self):
+        if self._geo is None:
+            return {}, {'geo': None}
+        data = self._geo.toArrays()
+        if data is None:
+            return None
+        arrays, attribute_map = data
+        return arrays, {'geo': attribute_map}
+
+    def _restore_disk_output(self, arrays, info):
+        geo = info.get('geo', None)
+        self.geo = None if geo is None else Mesh.fromArrays(arrays, geo)
+
     def get_port(self, port):
         if type(port) is not Port:
             return self.get_input(port)
@@ -39,16 +78,14 @@ class GeometryNode(AutoNode):
     def get_data(self, port):
         if self.disabled():
             return self.get_input_geometry(0, True)
+        memory_manager.touch(self)
         return self.geo
 
     @staticmethod
     def copy_geo(geo):
         if geo is None:
             return None
-        mesh = Mesh(copy.deepcopy(geo.mesh))
-        mesh.opts = copy.deepcopy(geo.opts)
-        mesh._attributeMap = copy.deepcopy(geo.attributeMap)
-        return mesh
+        return geo.shallowCopy()
 
     def get_input_geometry(self, port, ref=False):
         to_port = self.get_port(port)
@@ -61,7 +98,7 @@ class GeometryNode(AutoNode):
             return None
 
         for from_port in from_ports:
-            geo = from_port.node().get_data(from_port)
+            geo = self._slot_node(from_port.node()).get_data(from_port)
             if geo.getNumVertexes() == 0:
                 return None
             if ref:
@@ -82,7 +119,7 @@ class GeometryNode(AutoNode):
             return copy.deepcopy(self.defaultValue)
 
         for from_port in from_ports:
-            return from_port.node()
+            return self._slot_node(from_port.node())
 
     def copyData(self, index=0):
         self.geo = self.get_input_geometry(index)
@@ -94,16 +131,16 @@ class GeometryNode(AutoNode):
             self.graph.master.timeline.frameChanged.connect(self.update_frame)
 
     def get_frame(self):
-        return self.graph.master.timeline.getFrame()
+        return self._current_frame()
 
     def get_time(self):
-        return self.graph.master.timeline.getTime()
+        return float(self._current_frame()) / self.graph.master.timeline.fps
 
     def get_fps(self):
         return self.graph.master.timeline.fps
 
     def update_frame(self):
-        self.cook()
+        self.update_stream()
 
     def set_depend_time(self, state):
         if not self.has_property('Depend Time'):
@@ -1,7 +1,10 @@
 from .auto_node import AutoNode
+from .memory import memory_manager
+from .utils import get_data_nbytes
 from ...vendor.NodeGraphQt.base.port import Port
 from ...constants import NodeCategory
 import copy
+import numpy as np
 
 
 class ImageNode(AutoNode):
@@ -18,12 +21,47 @@ class ImageNode(AutoNode):
 
     @property
     def image(self):
+        self._ensure_output()
         return self._image
 
     @image.setter
     def image(self, image):
         self._image = image
 
+    def output_nbytes(self):
+        return super(ImageNode, self).output_nbytes() + get_data_nbytes(self._image)
+
+    def _release_output(self):
+        super(ImageNode, self)._release_output()
+        self._image = None
+
+    def _frame_slot(self, frame, slots):
+        slot = super(ImageNode, self)._frame_slot(frame, slots)
+        slot._image = None
+        return slot
+
+    def _cook_output(self):
+        data = super(ImageNode, self)._cook_output()
+        data['image'] = None if self._image is None else self._image.copy()
+        return data
+
+    def _restore_cook_output(self, data):
+        super(ImageNode, self)._restore_cook_output(data)
+        image = data.get('image', None)
+        self.image = None if image is None else image.copy()
+
+    def _disk_output(self):
+        if self._image is None:
+            return {}, {'image': None}
+        if not isinstance(self._image, dict) or \
+                not all(isinstance(v, np.ndarray) and v.dtype != object for v in self._image.values()):
+            return None
+        return {'image:' + name: data for name, data in self._image.items()}, {'image': list(self._image.keys())}
+
+    def _restore_disk_output(self, arrays, info):
+        names = info.get('image', None)
+        self.image = None if names is None else {name: arrays['image:' + name] for name in names}
+
     def get_port(self, port):
         if type(port) is not Port:
             return self.get_input(port)
@@ -33,6 +71,7 @@ class ImageNode(AutoNode):
     def get_data(self, port):
         if self.disabled():
             return self.get_input_image(0, True)
+        memory_manager.touch(self)
         return self.image
 
     def get_input_image(self, port, ref=False):
@@ -46,7 +85,7 @@ class ImageNode(AutoNode):
             return None
 
         for from_port in from_ports:
-            image = from_port.node().get_data(from_port)
+            image = self._slot_node(from_port.node()).get_data(from_port)
             if image is None:
                 return None
             if ref:
@@ -67,7 +106,7 @@ class ImageNode(AutoNode):
             return copy.deepcopy(self.defaultValue)
 
         for from_port in from_ports:
-            return from_port.node()
+            return self._slot_node(from_port.node())
 
     def copyData(self, index=0):
         self.image = self.get_input_image(index)
@@ -79,16 +118,16 @@ class ImageNode(AutoNode):
             self.graph.master.timeline.frameChanged.connect(self.update_frame)
 
     def get_frame(self):
-        return self.graph.master.timeline.getFrame()
+        return self._current_frame()
 
     def get_time(self):
-        return self.graph.master.timeline.getTime()
+        return float(self._current_frame()) / self.graph.master.timeline.fps
 
     def get_fps(self):
         return self.graph.master.timeline.fps
 
     def update_frame(self):
-        self.cook()
+        self.update_stream()
 
     def set_depend_time(self, state):
         if not self.has_property('Depend Time'):
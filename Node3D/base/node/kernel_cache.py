@@ -0,0 +1,215 @@
+from ...constants import WRANGLE_KERNEL_COUNT, WRANGLE_KERNEL_PATH, WRANGLE_KERNEL_FILES
+from collections import OrderedDict
+import importlib.util
+import threading
+import hashlib
+import types
+import time
+import numba
+import os
+
+
+class KernelCache(object):
+    """
+    LRU cache of the compiled wrangle kernels.
+    Kernels are stored by the hash of the generated source and the names, dtypes and shapes of the arguments,
+    so nodes with the same script share a kernel, and editing a script back or switching between inputs
+    doesn't compile again.
+    If the cache folder is set, the generated source is written to the folder and compiled with cache=True,
+    numba stores the machine code in the kernel cache folder and the kernel is loaded by later sessions.
+    Kernels failing to compile are removed from the folder, and least recently used kernels are removed
+    when the folder has more than max_files kernels.
+    """
+
+    def __init__(self, max_count=WRANGLE_KERNEL_COUNT, path=WRANGLE_KERNEL_PATH, max_files=WRANGLE_KERNEL_FILES):
+        self.max_count = max_count
+        self.path = path
+        self.max_files = max_files
+        # {key: kernel}
+        self._items = OrderedDict()
+        self._file_count = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def signature(args):
+        """
+        Returns the signature of the kernel arguments.
+
+        Args:
+            args(list): arrays and scalars passed to the kernel.
+
+        Returns:
+            tuple: (dtype, shape without the first dimension) for arrays, type name for scalars.
+        """
+
+        sig = []
+        for arg in args:
+            if hasattr(arg, 'dtype') and hasattr(arg, 'shape'):
+                sig.append((arg.dtype.str, tuple(arg.shape[1:])))
+            else:
+                sig.append(type(arg).__name__)
+        return tuple(sig)
+
+    @staticmethod
+    def get_key(source, signature, options):
+        """
+        Returns the cache key of the kernel.
+
+        Args:
+            source(str): generated kernel source.
+            signature(tuple): argument signature.
+            options(dict): numba.jit options.
+        """
+
+        key = repr((source, signature, sorted(options.items())))
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def get(self, source, func_name, args, namespace, **options):
+        """
+        Get the compiled kernel, compile it for the arguments if it is not cached.
+
+        Args:
+            source(str): generated kernel source.
+            func_name(str): kernel function name in the source.
+            args(list): arrays and scalars passed to the kernel.
+            namespace(dict): globals of the kernel.
+            options: numba.jit options.
+
+        Returns:
+            numba.core.registry.CPUDispatcher: the kernel.
+
+        Raises:
+            Exception: the source fails to compile.
+        """
+
+        key = self.get_key(source, self.signature(args), options)
+        with self._lock:
+            kernel = self._items.get(key, None)
+            if kernel is not None:
+                self._items.move_to_end(key)
+                return kernel
+
+            # compile now, so the kernel is only stored if it compiles.
+            arg_types = tuple(numba.typeof(arg) for arg in args)
+            kernel = None
+            header = self._module_header(namespace)
+            if self.path and header is not None:
+                kernel = self._load_module(key, header + source, func_name, arg_types, options)
+            if kernel is None:
+                scope = dict(namespace)
+                exec(source, scope)
+                kernel = numba.jit(**options)(scope[func_name])
+                kernel.compile(arg_types)
+
+            self._items[key] = kernel
+            while len(self._items) > self.max_count:
+                self._items.popitem(last=False)
+            return kernel
+
+    def clear(self):
+        """
+        Remove all kernels from memory, the files in the cache folder are kept.
+        """
+
+        with self._lock:
+            self._items.clear()
+
+    @staticmethod
+    def _module_header(namespace):
+        # modules are imported by the kernel file, objects such as the node can not be used in nopython mode.
+        # other values can not be written to the file, so the kernel is not persisted.
+        lines = []
+        for name, value in namespace.items():
+            if isinstance(value, types.ModuleType):
+                lines.append('import {} as {}'.format(value.__name__, name))
+            elif isinstance(value, (int, float, bool, str, tuple, list, dict)):
+                return None
+        lines.append('')
+        return '\n'.join(lines)
+
+    def _load_module(self, key, source, func_name, arg_types, options):
+        file_path = os.path.join(self.path, '{}.py'.format(key))
+        created = False
+        try:
+            if not os.path.exists(file_path):
+                os.makedirs(self.path, exist_ok=True)
+                # numba checks the modified time of the file, so never write an existing kernel again.
+                temp_path = '{}.{}.tmp'.format(file_path, os.getpid())
+                with open(temp_path, 'w') as file_out:
+                    file_out.write(source)
+                os.replace(temp_path, file_path)
+                created = True
+            else:
+                # the access time records the last use, the modified time is kept for numba.
+                os.utime(file_path, (time.time(), os.stat(file_path).st_mtime))
+        except OSError:
+            return None
+
+        try:
+            spec = importlib.util.spec_from_file_location('node3d_wrangle_{}'.format(key), file_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            kernel = numba.jit(cache=True, **options)(getattr(module, func_name))
+            kernel.compile(arg_types)
+        except BaseException:
+            # numba only saves the kernels which compile, the source and its byte code are removed here.
+            self._remove_files([key], [self.path])
+            raise
+
+        if created:
+            with self._lock:
+                if self._file_count is not None:
+                    self._file_count += 1
+                over = self._file_count is None or self._file_count > self.max_files
+            if over:
+                self.cleanup()
+        return kernel
+
+    def _remove_files(self, keys, folders):
+        # files of a kernel are named after its key, such as the numba index <key>.run_per_vertex-2.py38.nbi.
+        keys = set(keys)
+        for folder in folders:
+            for root, _, names in os.walk(folder):
+                for name in names:
+                    if name.split('.', 1)[0] not in keys:
+                        continue
+                    try:
+                        os.remove(os.path.join(root, name))
+                    except OSError:
+                        pass
+
+    def cleanup(self):
+        """
+        Remove the least recently used kernels from the cache folder until it is under max_files kernels.
+        """
+
+        if not self.path:
+            return
+        with self._lock:
+            files = []
+            try:
+                names = os.listdir(self.path)
+            except OSError:
+                names = []
+            for name in names:
+                if not name.endswith('.py'):
+                    continue
+                try:
+                    files.append((os.stat(os.path.join(self.path, name)).st_atime, name[:-3]))
+                except OSError:
+                    continue
+            count = len(files)
+            if count > self.max_files:
+                # leave some space so the next kernel doesn't clean up again.
+                remove = count - int(self.max_files * 0.9)
+                keys = [key for _, key in sorted(files)[:remove]]
+                # numba saves the index and machine code into NUMBA_CACHE_DIR, or __pycache__ next to the source.
+                folders = [self.path]
+                if numba.config.CACHE_DIR:
+                    folders.append(numba.config.CACHE_DIR)
+                self._remove_files(keys, folders)
+                count -= len(keys)
+            self._file_count = count
+
+
+kernel_cache = KernelCache()
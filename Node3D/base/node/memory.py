@@ -0,0 +1,128 @@
+from ...constants import OUTPUT_MEMORY_SIZE, GC_THRESHOLD
+from collections import OrderedDict
+import threading
+import weakref
+import gc
+
+
+class MemoryManager(object):
+    """
+    Keep the cooked outputs of all nodes under a memory budget.
+    Nodes are ordered by the last time their outputs are used, by a down stream node or a viewer.
+    When the budget is exceeded, the outputs of the least recently used nodes are released
+    and cooked again when they are needed.
+    Released objects are collected by the garbage collector after enough memory is released,
+    instead of collecting on every output change.
+    """
+
+    def __init__(self, max_size=OUTPUT_MEMORY_SIZE, gc_threshold=GC_THRESHOLD):
+        self.max_size = max_size
+        self.gc_threshold = gc_threshold
+        # {node id: [weakref of node, size]}
+        self._nodes = OrderedDict()
+        self._size = 0
+        self._released = 0
+        self._lock = threading.RLock()
+
+    def size(self):
+        """
+        Returns the memory size of the tracked outputs in bytes.
+        """
+
+        return self._size
+
+    def set_max_size(self, max_size):
+        """
+        Set the memory budget, outputs are released if it is exceeded.
+
+        Args:
+            max_size(int): bytes.
+        """
+
+        with self._lock:
+            self.max_size = max_size
+        self._evict()
+
+    def update(self, node):
+        """
+        Update the output size of the node after it is cooked.
+
+        Args:
+            node(AutoNode).
+        """
+
+        size = node.output_nbytes()
+        with self._lock:
+            item = self._nodes.pop(node.id, None)
+            if item is not None:
+                self._size -= item[1]
+            self._nodes[node.id] = [weakref.ref(node), size]
+            self._size += size
+        self._evict(node)
+
+    def touch(self, node):
+        """
+        Mark the outputs of the node as recently used.
+
+        Args:
+            node(AutoNode).
+        """
+
+        with self._lock:
+            if node.id in self._nodes:
+                self._nodes.move_to_end(node.id)
+
+    def remove(self, node):
+        """
+        Stop tracking the outputs of the node.
+
+        Args:
+            node(AutoNode).
+        """
+
+        with self._lock:
+            item = self._nodes.pop(node.id, None)
+            if item is not None:
+                self._size -= item[1]
+
+    def _evict(self, keep=None):
+        with self._lock:
+            if self._size <= self.max_size:
+                return
+            items = list(self._nodes.items())
+
+        for node_id, (ref, size) in items:
+            if self._size <= self.max_size:
+                break
+            node = ref()
+            if node is keep:
+                continue
+            if node is None or node.release_output():
+                with self._lock:
+                    if self._nodes.pop(node_id, None) is not None:
+                        self._size -= size
+                self.release(size)
+
+    def release(self, size):
+        """
+        Record released memory, the garbage collector runs after enough memory is released.
+
+        Args:
+            size(int): released bytes.
+        """
+
+        self._released += size
+        if self._released >= self.gc_threshold:
+            self.collect()
+
+    def collect(self):
+        """
+        Run the garbage collector if any memory is released since the last collection.
+        """
+
+        if self._released > 0:
+            self._released = 0
+            gc.collect()
+
+
+memory_manager = MemoryManager()
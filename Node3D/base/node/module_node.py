@@ -49,12 +49,10 @@ class ModuleNode(AutoNode):
         self.add_combo_menu('funcs', 'Functions', items=list(self.module_functions.keys()))
 
         # switch math function type
-        self.view.widgets['funcs'].value_changed.connect(self.add_function)
+        self.connect_widget('funcs', self.add_function)
         self.add_output('output')
-        self.create_property('output', None)
 
-        self.view.widgets['funcs'].widget.setCurrentIndex(0)
-        self.add_function(None, self.view.widgets['funcs'].widget.currentText())
+        self.add_function(None, self.get_property('funcs'))
 
     def is_function(self, obj):
         if inspect.isfunction(self.func) or inspect.isbuiltin(self.func):
@@ -123,6 +121,6 @@ class ModuleNode(AutoNode):
                 data = self.func
             if data is None:
                 data = args[0]
-            self.set_property('output', data)
+            self.set_output_data('output', data)
         except Exception as error:
             self.error("Error : %s" % str(error))
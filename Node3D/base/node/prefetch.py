@@ -0,0 +1,61 @@
+from ...vendor.NodeGraphQt import QtCore
+from ...constants import PREFETCH_FRAMES
+
+
+def get_time_dependent_nodes(graph):
+    """
+    Returns all nodes of the graph which depend on time.
+
+    Args:
+        graph(NodeGraphQt.NodeGraph).
+
+    Returns:
+        list[AutoNode].
+    """
+
+    return [node for node in graph.all_nodes()
+            if node.has_property('Depend Time') and node.get_property('Depend Time')]
+
+
+class FramePrefetcher(QtCore.QObject):
+    """
+    Cook the frames after the play head while the timeline is playing,
+    the cooked outputs are kept by the frame cache, so the playback only restores them.
+    Frames are cooked by the cook worker when it has no other request.
+    """
+
+    def __init__(self, graph, timeline, cook_worker, frames=PREFETCH_FRAMES):
+        super(FramePrefetcher, self).__init__(timeline)
+        self.graph = graph
+        self.timeline = timeline
+        self.cook_worker = cook_worker
+        self.frames = frames
+        self.timeline.frameChanged.connect(self.on_frame_changed)
+        self.timeline.timeline.stateChanged.connect(self.on_state_changed)
+
+    def prefetch_frames(self, frame):
+        """
+        Returns the frames to prefetch after the frame in the play direction.
+
+        Args:
+            frame(int): current frame.
+
+        Returns:
+            list[int].
+        """
+
+        start, end = self.timeline.getFrameRange()
+        if self.timeline.isForward():
+            return list(range(frame + 1, min(frame + self.frames, end) + 1))
+        return list(range(frame - 1, max(frame - self.frames, start) - 1, -1))
+
+    def on_frame_changed(self, frame):
+        if self.frames <= 0 or not self.timeline.isPlaying():
+            return
+        nodes = get_time_dependent_nodes(self.graph)
+        if nodes:
+            self.cook_worker.prefetch(self.prefetch_frames(frame), nodes)
+
+    def on_state_changed(self, state):
+        if state != QtCore.QTimeLine.Running:
+            self.cook_worker.prefetch([], [])
@@ -13,6 +13,13 @@ class ScriptNode(GeometryNode):
         self.create_property('Depend Time', False, widget_type=NODE_PROP_QCHECKBOX)
         self.namespace = {'node': self, 'np': np, 'gp': self.graph, 'math': math}
 
+    def _frame_slot(self, frame, slots):
+        slot = super(ScriptNode, self)._frame_slot(frame, slots)
+        # the script of the slot must see the slot as node, not the node at the play head.
+        slot.namespace = dict(self.namespace)
+        slot.namespace['node'] = slot
+        return slot
+
     def update_namespace(self, namespace):
         self.namespace.update(namespace)
 
@@ -0,0 +1,58 @@
+import threading
+
+
+class SessionOutputs(object):
+    """
+    Cooked outputs stored in the opened binary session file.
+    Arrays are read from the file when a node with the same cache key is cooked,
+    so opening a session doesn't read the outputs which are never used.
+    """
+
+    def __init__(self):
+        self._file = None
+        # {cache key: (array names, info)}
+        self._outputs = {}
+        self._lock = threading.Lock()
+
+    def set(self, npz_file, outputs):
+        """
+        Replace the stored outputs by the outputs of a new session file.
+
+        Args:
+            npz_file(numpy.lib.npyio.NpzFile): opened session file.
+            outputs(dict): {cache key: {'arrays': {name: member name}, 'info': info}}.
+        """
+
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = npz_file
+            self._outputs = outputs
+
+    def get(self, cache_key):
+        """
+        Read the stored outputs.
+
+        Args:
+            cache_key(str): node cache key.
+
+        Returns:
+            (dict, dict): {name: numpy.ndarray} and the info, None if the key is not stored.
+        """
+
+        with self._lock:
+            item = self._outputs.get(cache_key, None)
+            if item is None:
+                return None
+            arrays = {name: self._file[member] for name, member in item['arrays'].items()}
+            return arrays, item['info']
+
+    def remove(self, cache_key):
+        with self._lock:
+            self._outputs.pop(cache_key, None)
+
+    def clear(self):
+        self.set(None, {})
+
+
+session_outputs = SessionOutputs()
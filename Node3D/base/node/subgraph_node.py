@@ -1,8 +1,103 @@
 from .auto_node import AutoNode
-from ...vendor.NodeGraphQt import SubGraph, topological_sort_by_down, BackdropNode
+from ...vendor.NodeGraphQt import SubGraph, topological_sort_by_down, BackdropNode, QtCore
 import json, os
+import threading
+import weakref
+import copy
 from .utils import update_node_down_stream
-from ...constants import NodeCategory
+from ...constants import NodeCategory, VIEW_RELEASE_TIME
+
+
+class SubGraphCookPlan(object):
+    """
+    Flat cook plan of a sub graph.
+    It resolves the sub graph input/output nodes by index, the up stream ports of the sub graph inputs
+    and the cook order of the children once, and is compiled again only when the topology inside
+    the sub graph or the input/output nodes are changed.
+    The input/output nodes are the shared children of the template if the node is not materialized.
+    """
+
+    def __init__(self, node, signature, shared=None):
+        self.signature = signature
+        self.shared = shared
+        source = node if shared is None else shared
+        # {input index: [SubGraphInputNode]}
+        self.input_nodes = {}
+        # {output index: SubGraphOutputNode}
+        self.output_nodes = {}
+        # {input Port: input index}
+        self.port_indexes = {}
+        # {input index: up stream Port or None}
+        self.input_ports = {}
+
+        for n in source.sub_graph_input_nodes:
+            self.input_nodes.setdefault(int(n.get_property('input index')), []).append(n)
+        for n in source.sub_graph_output_nodes:
+            self.output_nodes.setdefault(int(n.get_property('output index')), n)
+        for index, port in enumerate(node.input_ports()):
+            self.port_indexes[port] = index
+            from_ports = port.connected_ports()
+            self.input_ports[index] = from_ports[0] if from_ports else None
+        self.all_input_nodes = list(source.sub_graph_input_nodes)
+        # {frozenset of input indexes or None: (sorted nodes, marked sub graph ports)}.
+        self._orders = {}
+
+    def start_nodes(self, indexes=None):
+        """
+        Returns the sub graph input nodes of the input indexes.
+
+        Args:
+            indexes(set[int]): input indexes, None means all inputs.
+
+        Returns:
+            list[SubGraphInputNode].
+        """
+
+        if indexes is None:
+            return list(self.all_input_nodes)
+        return [n for index in sorted(indexes) for n in self.input_nodes.get(index, [])]
+
+    def cook_order(self, indexes=None):
+        """
+        Returns the children to cook in topological order from the sub graph input nodes of the input indexes.
+
+        Args:
+            indexes(set[int]): input indexes, None means all inputs.
+
+        Returns:
+            list[AutoNode].
+        """
+
+        key = None if indexes is None else frozenset(indexes)
+        order = self._orders.get(key, None)
+        if order is None:
+            nodes = topological_sort_by_down(start_nodes=self.start_nodes(indexes))
+            # nested sub graphs only cook the inputs connected from the sorted nodes.
+            marks = [(port.node(), port) for node in nodes for out_port in node.output_ports()
+                     for port in out_port.connected_ports() if isinstance(port.node(), SubGraphNode)]
+            order = (nodes, marks)
+            self._orders[key] = order
+        [node.mark_node_to_be_cooked(port) for node, port in order[1]]
+        return list(order[0])
+
+
+class SharedSubGraph(object):
+    """
+    Children created once from a published template for all instances of the template in a graph.
+    The instances which are not materialized cook them one by one with their own inputs,
+    the children outputs are keyed by their up stream cache keys, so every instance gets the outputs of its inputs.
+    """
+
+    def __init__(self, graph, template):
+        self.template = template
+        self.lock = threading.RLock()
+        # the template is shared by other nodes, the children get their own copy of the values.
+        self._children = graph._deserialize(copy.deepcopy(template), set_parent=False, attach_views=False) or []
+        self.sub_graph_input_nodes = [n for n in self._children if isinstance(n, SubGraphInputNode)]
+        self.sub_graph_output_nodes = [n for n in self._children if isinstance(n, SubGraphOutputNode)]
+
+    def children(self):
+        return list(self._children)
 
 
 class SubGraphNode(AutoNode, SubGraph):
@@ -11,6 +106,7 @@ class SubGraphNode(AutoNode, SubGraph):
     """
     NODE_CATEGORY = NodeCategory.NONE
     CHILDREN_CATEGORY = NodeCategory.NONE
+    CACHE_ENABLED = False
 
     def __init__(self, defaultInputType=None, defaultOutputType=None, dynamic_port=True):
         super(SubGraphNode, self).__init__(defaultInputType, defaultOutputType)
@@ -34,7 +130,12 @@ class SubGraphNode(AutoNode, SubGraph):
         else:
             self.create_property('input count', 0)
             self.create_property('output count', 0)
-        self._marked_ports = []
+        self._marked_ports = set()
+        self._cook_plan = None
+        self._template = None
+        # outputs of the shared children cooked for the node, see SharedSubGraph.
+        self._shared_outputs = None
+        self._release_timer = None
         self.create_property('create_from_select', True)
         self._inited = True
 
@@ -46,8 +147,93 @@ class SubGraphNode(AutoNode, SubGraph):
             port(Port)
         """
 
-        if port not in self._marked_ports and port in self.input_ports():
-            self._marked_ports.append(port)
+        if port in self.cook_plan().port_indexes:
+            self._marked_ports.add(port)
+
+    def _cook_plan_signature(self, shared=None):
+        version = None if self.graph is None else self.graph.model.topology.sub_graph_version(self)
+        source = self if shared is None else shared
+        io_nodes = tuple((n.id, n.get_property('input index')) for n in source.sub_graph_input_nodes) + \
+            tuple((n.id, n.get_property('output index')) for n in source.sub_graph_output_nodes)
+        return version, len(self.input_ports()), io_nodes
+
+    def set_template(self, template):
+        """
+        Set the serialized sub graph to create the children from when they are needed.
+        The template may be shared by other nodes and is never changed.
+
+        Args:
+            template(dict): serialized sub graph data.
+        """
+
+        self._template = template
+
+    def shared_sub_graph(self):
+        """
+        Returns the children shared by the instances of the template,
+        None if the node has its own children.
+
+        Returns:
+            SharedSubGraph.
+        """
+
+        template = self._template
+        if template is None or self.graph is None:
+            return None
+        with _template_lock:
+            shared_graphs = _shared_sub_graphs.setdefault(self.graph, {})
+            shared = shared_graphs.get(id(template), None)
+            if shared is None:
+                shared = SharedSubGraph(self.graph, template)
+                shared_graphs[id(template)] = shared
+            return shared
+
+    def materialize(self):
+        """
+        Create the own children of the node from the template if they are not created yet,
+        it is done when the sub graph is entered or its children are accessed.
+        Until then the node is cooked by the shared children of the template.
+        """
+
+        if self._template is None:
+            return
+        with _template_lock:
+            template, self._template = self._template, None
+            if template is None or self.graph is None:
+                return
+            # the template is shared by other nodes, the children get their own copy of the values.
+            template = copy.deepcopy(template)
+            children = self.graph._deserialize(template, set_parent=False, attach_views=False) or []
+            [node.set_parent(self) for node in children]
+
+    def prepare_children(self):
+        """
+        Create the children needed to cook the sub graph and the nested sub graphs,
+        the shared children of the template if the node is not materialized.
+        The cook worker calls it in the GUI thread before cooking the sub graph, since the nodes are added into the graph.
+        """
+
+        shared = self.shared_sub_graph()
+        children = list(self._children) if shared is None else shared.children()
+        for node in children:
+            if isinstance(node, SubGraphNode):
+                node.prepare_children()
+
+    def cook_plan(self):
+        """
+        Returns the compiled cook plan of the sub graph.
+
+        Returns:
+            SubGraphCookPlan.
+        """
+
+        shared = self.shared_sub_graph()
+        signature = self._cook_plan_signature(shared)
+        plan = self._cook_plan
+        if plan is None or plan.signature != signature:
+            plan = SubGraphCookPlan(self, signature, shared)
+            self._cook_plan = plan
+        return plan
 
     def is_editable(self):
         """
@@ -65,9 +251,14 @@ class SubGraphNode(AutoNode, SubGraph):
     def enter(self):
         """
         Action when enter the sub graph.
+        The children are created without views, their views are created here.
         """
 
+        self.materialize()
+        if self._release_timer is not None:
+            self._release_timer.stop()
         self.hide()
+        self.graph.attach_views(self.children())
         [n.show() for n in self.children()]
         rect = self.get_property('graph_rect')
         if rect:
@@ -83,6 +274,22 @@ class SubGraphNode(AutoNode, SubGraph):
             n.set_selected(False)
         self.model.set_property('graph_rect', self.graph.graph_rect())
 
+        if VIEW_RELEASE_TIME >= 0:
+            if self._release_timer is None:
+                self._release_timer = QtCore.QTimer(self)
+                self._release_timer.setSingleShot(True)
+                self._release_timer.timeout.connect(self.release_views)
+            self._release_timer.start(int(VIEW_RELEASE_TIME * 1000))
+
+    def release_views(self):
+        """
+        Delete the views of the children if the sub graph is not entered,
+        they are created again by the next enter.
+        """
+
+        if self.graph is not None and self.graph.get_node_space() is not self:
+            self.graph.detach_views(self.children())
+
     def show(self):
         AutoNode.show(self)
         self.update_port()
@@ -156,31 +363,45 @@ class SubGraphNode(AutoNode, SubGraph):
         if port is None:
             return None
         index = int(port.name()[-1])
-        for node in self.sub_graph_output_nodes:
-            if node.get_property('output index') == index:
-                return node.get_data(None)
+        if self._shared_outputs is not None:
+            return self._shared_outputs.get(index, self.defaultValue)
+        plan = self.cook_plan()
+        if plan.shared is not None:
+            # the shared children are not cooked for the node yet.
+            return self.defaultValue
+        node = plan.output_nodes.get(index, None)
+        if node is not None:
+            return node.get_data(None)
         self.error('can\'t find matched index output node !!!')
         return self.defaultValue
 
     def run(self):
         self.update_ports()
+        plan = self.cook_plan()
+
+        if plan.shared is not None:
+            with plan.shared.lock:
+                # the other instances cooked the shared children with their inputs, so all of them are cooked again,
+                # the unchanged ones are restored from their cache keys.
+                self._marked_ports = set()
+                [setattr(node, '_parent', self) for node in plan.shared.children()]
+                self._cook_children(plan.cook_order())
+                self._shared_outputs = {index: node.get_data(None) for index, node in plan.output_nodes.items()}
+            return
 
-        for node in self.sub_graph_input_nodes:
+        for node in plan.all_input_nodes:
             node._parent = self
 
-        start_nodes = []
         if self._marked_ports:
-            for port in self._marked_ports:
-                index = self.input_ports().index(port)
-                for node in self.sub_graph_input_nodes:
-                    if node.get_property('input index') == index:
-                        start_nodes.append(node)
-            self._marked_ports = []
+            marked_ports, self._marked_ports = self._marked_ports, set()
+            indexes = set(plan.port_indexes[p] for p in marked_ports if p in plan.port_indexes)
         else:
-            start_nodes = self.sub_graph_input_nodes
+            indexes = None
 
-        nodes = topological_sort_by_down(start_nodes=start_nodes)
+        self._cook_children(plan.cook_order(indexes))
+        self._shared_outputs = None
 
+    def _cook_children(self, nodes):
         for node in nodes:
             if node.disabled():
                 continue
@@ -209,6 +430,7 @@ class SubGraphNode(AutoNode, SubGraph):
             list[AutoNode].
         """
 
+        self.materialize()
         return list(self._children)
 
     def create_input_node(self, update=True):
@@ -406,7 +628,12 @@ class SubGraphInputNode(AutoNode):
     def get_data(self, port):
         parent = self.parent()
         if parent is not None:
-            from_port = self.get_parent_port(parent)
+            input_ports = parent.cook_plan().input_ports
+            index = int(self.get_property('input index'))
+            if index in input_ports:
+                from_port = input_ports[index]
+            else:
+                from_port = self.get_parent_port(parent)
             if from_port:
                 return from_port.node().get_data(from_port)
             else:
@@ -416,6 +643,15 @@ class SubGraphInputNode(AutoNode):
             # can not find parent
             return self.defaultValue
 
+    def _upstream_ports(self):
+        parent = self.parent()
+        if parent is None:
+            return []
+        from_port = parent.cook_plan().input_ports.get(int(self.get_property('input index')), None)
+        if from_port:
+            return [('parent', from_port)]
+        return []
+
     def get_parent_port(self, parent=None):
         if parent is None:
             parent = self.parent()
@@ -462,6 +698,7 @@ class SubGraphOutputNode(AutoNode):
         if not parent.auto_cook:
             return
 
+        parent.clear_cache()
         port = parent.get_output(self.get_property('output index'))
         if not port:
             return
@@ -500,6 +737,11 @@ class RootNode(SubGraphNode):
         return False
 
 
+_template_lock = threading.RLock()
+# {graph: {id(template): SharedSubGraph}}, the SharedSubGraph keeps its template alive.
+_shared_sub_graphs = weakref.WeakKeyDictionary()
+
+
 def read_json(file_path):
     file_path = file_path.strip()
     if not os.path.isfile(file_path):
@@ -513,6 +755,51 @@ def read_json(file_path):
     return layout_data
 
 
+class PublishedTemplateCache(object):
+    """
+    Parsed published node files shared by all instances of the published nodes.
+    A file is parsed again only when its modified time or size is changed.
+    The returned data is shared, so it must not be changed.
+    """
+
+    def __init__(self):
+        # {file path: (modified time, size, data)}
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def get(self, file_path):
+        """
+        Returns the parsed data of the published node file.
+
+        Args:
+            file_path(str): published node file path.
+
+        Returns:
+            dict: None if the file can not be read.
+        """
+
+        file_path = os.path.abspath(file_path.strip())
+        if not os.path.isfile(file_path):
+            raise IOError('node file {} does not exist.'.format(file_path))
+        stat = os.stat(file_path)
+        with self._lock:
+            item = self._templates.get(file_path, None)
+            if item is not None and item[:2] == (stat.st_mtime, stat.st_size):
+                return item[2]
+        data = read_json(file_path)
+        if data is not None:
+            with self._lock:
+                self._templates[file_path] = (stat.st_mtime, stat.st_size, data)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+
+published_templates = PublishedTemplateCache()
+
+
 class PublishedNode(object):
     """
     Read published sub graph file and create corresponding node class.
@@ -530,28 +817,26 @@ class PublishedNode(object):
 
         if self.NODE_FILE is None or not self.get_property('published'):
             return
-        data = read_json(self.NODE_FILE)
+        data = published_templates.get(self.NODE_FILE)
         if not data:
             return
 
-        children_data = data.pop('sub_graph')
-
         if not self.create_by_deserialize:
-            n_data = data.pop('node')
-            n_data.pop('name')
+            # the file data is shared, copy the values which can be changed on this node.
+            n_data = data['node']
             # set properties.
             for prop in self.model.properties.keys():
-                if prop in n_data.keys():
-                    self.model.set_property(prop, n_data[prop])
+                if prop in n_data.keys() and prop != 'name':
+                    self.model.set_property(prop, copy.deepcopy(n_data[prop]))
             # set custom properties.
             for prop, val in n_data.get('custom', {}).items():
-                self.model.set_property(prop, val)
+                self.model.set_property(prop, copy.deepcopy(val))
 
             if n_data.get('dynamic_port', None):
                 self.set_ports({'input_ports': n_data['input_ports'], 'output_ports': n_data['output_ports']})
 
-        children = self.graph._deserialize(children_data, set_parent=False)
-        [node.set_parent(self) for node in children]
+        # children are created when the sub graph is entered or cooked.
+        self.set_template(data['sub_graph'])
 
     @staticmethod
     def create_node_class(file_path, parent_class):
@@ -563,7 +848,7 @@ class PublishedNode(object):
             parent_class(object): published node class.
         """
 
-        data = read_json(file_path)
+        data = published_templates.get(file_path)
 
         if not data:
             return None
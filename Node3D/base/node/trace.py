@@ -0,0 +1,156 @@
+import threading
+import time
+import json
+import os
+import numpy as np
+
+
+def get_data_size(data):
+    """
+    Get a rough size of the node data for tracing.
+
+    Args:
+        data(object): node data.
+
+    Returns:
+        int/dict/None: bytes of arrays, element counts of meshes, length of containers.
+    """
+
+    if data is None:
+        return None
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if hasattr(data, 'getNumVertexes'):
+        return {'vertexes': data.getNumVertexes(), 'faces': data.getNumFaces()}
+    if isinstance(data, dict):
+        return sum(v.nbytes for v in data.values() if isinstance(v, np.ndarray))
+    if isinstance(data, (list, tuple, str)):
+        return len(data)
+    return None
+
+
+class CookTracer(object):
+    """
+    Record the cook of every node and export them to the Chrome trace event format,
+    which can be opened by chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self):
+        self._events = []
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._enabled = False
+
+    def enabled(self):
+        return self._enabled
+
+    def start(self):
+        """
+        Clear the recorded events and start tracing.
+        """
+
+        with self._lock:
+            self._events = []
+            self._threads = {}
+        self._enabled = True
+
+    def stop(self):
+        """
+        Stop tracing, the recorded events are kept.
+        """
+
+        self._enabled = False
+
+    def begin(self):
+        """
+        Returns the begin timestamp of a cook, None if tracing is disabled.
+        """
+
+        if not self._enabled:
+            return None
+        return time.perf_counter_ns()
+
+    def end(self, node, begin_ns, cached=False):
+        """
+        Record a node cook.
+
+        Args:
+            node(AutoNode): cooked node.
+            begin_ns(int): timestamp returned by CookTracer.begin.
+            cached(bool): whether the node reused its cached output.
+        """
+
+        if begin_ns is None or not self._enabled:
+            return
+        end_ns = time.perf_counter_ns()
+        thread = threading.current_thread()
+
+        args = {'path': node.path(),
+                'type': node.type_,
+                'cached': cached,
+                'error': node.has_error()}
+        if not cached:
+            args['inputs'] = self._input_sizes(node)
+            args['outputs'] = self._output_sizes(node)
+
+        event = {'name': node.name(),
+                 'cat': node.type_,
+                 'ph': 'X',
+                 'ts': begin_ns / 1000.0,
+                 'dur': (end_ns - begin_ns) / 1000.0,
+                 'pid': os.getpid(),
+                 'tid': thread.ident,
+                 'args': args}
+        with self._lock:
+            self._events.append(event)
+            self._threads[thread.ident] = thread.name
+
+    @staticmethod
+    def _input_sizes(node):
+        sizes = {}
+        try:
+            for to_port in node.input_ports():
+                for from_port in to_port.connected_ports():
+                    sizes[to_port.name()] = get_data_size(node._slot_node(from_port.node()).get_data(from_port))
+        except Exception:
+            pass
+        return sizes
+
+    @staticmethod
+    def _output_sizes(node):
+        sizes = {}
+        try:
+            for port in node.output_ports():
+                sizes[port.name()] = get_data_size(node.get_data(port))
+        except Exception:
+            pass
+        return sizes
+
+    def events(self):
+        """
+        Returns all recorded trace events, including the thread name events.
+        """
+
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        pid = os.getpid()
+        for tid, name in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                           'args': {'name': name}})
+        return events
+
+    def save(self, file_path):
+        """
+        Save the trace as a Chrome trace event JSON file.
+
+        Args:
+            file_path(str): trace file path.
+        """
+
+        file_path = file_path.strip()
+        with open(file_path, 'w') as file_out:
+            json.dump({'traceEvents': self.events(), 'displayTimeUnit': 'ms'}, file_out)
+
+
+tracer = CookTracer()
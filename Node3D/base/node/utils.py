@@ -1,42 +1,261 @@
 from ...vendor.NodeGraphQt import topological_sort_by_down, QtCore
-from threading import Thread
+from ...vendor.NodeGraphQt.base.utils import get_input_nodes
+from ...constants import COOK_THREAD_COUNT
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import time
+import numpy as np
+import itertools
+import threading
 import hashlib
+import copy
+import sys
+import os
 
 
-class CookThread(Thread):
-    def __init__(self):
-        super(CookThread, self).__init__()
-        self.start_nodes = None
-        self.all_nodes = None
+class CookScheduler(object):
+    """
+    Cook nodes by dependency order.
+    Independent branches are cooked concurrently by a thread pool,
+    and a failed node only stops its down stream nodes.
+    Only nodes which are parallel safe (see AutoNode.is_parallel_safe) are cooked by the pool,
+    the other nodes are cooked in the calling thread while no node is cooked by the pool.
+    """
+
+    def __init__(self, max_workers=1):
+        self.max_workers = max(1, max_workers)
+        self.cook_times = {}
+        self.failed_nodes = set()
+        self.critical_path = []
+        self.critical_path_time = 0.0
+        self.total_time = 0.0
+        self._cancelled = False
+        self._cooking = set()
+        self._cooking_lock = threading.Lock()
+
+    def cancel(self):
+        """
+        Stop cooking, the nodes being cooked are interrupted and no new node will be cooked.
+        """
+
+        self._cancelled = True
+        with self._cooking_lock:
+            nodes = list(self._cooking)
+        [node.interrupt() for node in nodes]
+
+    def cancelled(self):
+        return self._cancelled
+
+    def node_started(self, node):
+        """
+        Called before the node is cooked, maybe in a worker thread.
+        """
+
+        pass
+
+    def node_finished(self, node):
+        """
+        Called after the node is cooked, maybe in a worker thread.
+        """
+
+        pass
+
+    def _cook(self, node):
+        start_time = time.perf_counter()
+        if not node.disabled():
+            self.node_started(node)
+            with self._cooking_lock:
+                self._cooking.add(node)
+            try:
+                node.cook()
+            finally:
+                with self._cooking_lock:
+                    self._cooking.discard(node)
+            self.node_finished(node)
+        return time.perf_counter() - start_time, not node.has_error()
+
+    def run(self, nodes):
+        """
+        Cook the nodes.
+
+        Args:
+            nodes(list[AutoNode]): topological sorted nodes.
+        """
+
+        self.cook_times = {}
+        self.failed_nodes = set()
+        node_set = set(nodes)
+        inputs = {node: [n for n in get_input_nodes(node) if n in node_set] for node in nodes}
+        outputs = {node: [] for node in nodes}
+        for node in nodes:
+            for n in inputs[node]:
+                outputs[n].append(node)
+
+        start_time = time.perf_counter()
+        if self.max_workers == 1:
+            for node in nodes:
+                if self._cancelled:
+                    break
+                if self._is_blocked(node, inputs):
+                    continue
+                self._finish(node, *self._cook(node))
+        else:
+            self._run_parallel(nodes, inputs, outputs)
+        self.total_time = time.perf_counter() - start_time
+
+        self._compute_critical_path(nodes, inputs)
+
+    def _is_blocked(self, node, inputs):
+        for n in inputs[node]:
+            if n in self.failed_nodes:
+                self.failed_nodes.add(node)
+                return True
+        return False
 
-    def run(self):
-        _update_nodes(topological_sort_by_down(start_nodes=self.start_nodes,
-                                               all_nodes=self.all_nodes))
+    def _finish(self, node, cook_time, success):
+        self.cook_times[node] = cook_time
+        if not success:
+            self.failed_nodes.add(node)
+
+    def _run_parallel(self, nodes, inputs, outputs):
+        pending = {node: len(inputs[node]) for node in nodes}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {}
+            serial = []
+            ready = [node for node in nodes if pending[node] == 0]
+            while True:
+                # blocked nodes release their outputs immediately and extend the ready list.
+                for node in ready:
+                    if self._cancelled:
+                        break
+                    if self._is_blocked(node, inputs):
+                        self._release(node, pending, outputs, ready)
+                    elif node.is_parallel_safe():
+                        futures[pool.submit(self._cook, node)] = node
+                    else:
+                        serial.append(node)
+                ready = []
+                if not futures:
+                    if not serial or self._cancelled:
+                        break
+                    node = serial.pop(0)
+                    self._finish(node, *self._cook(node))
+                    self._release(node, pending, outputs, ready)
+                    continue
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = futures.pop(future)
+                    self._finish(node, *future.result())
+                    self._release(node, pending, outputs, ready)
+
+    @staticmethod
+    def _release(node, pending, outputs, ready):
+        for n in outputs[node]:
+            pending[n] -= 1
+            if pending[n] == 0:
+                ready.append(n)
+
+    def _compute_critical_path(self, nodes, inputs):
+        finish_times = {}
+        previous = {}
+        for node in nodes:
+            if node not in self.cook_times:
+                continue
+            start_time = 0.0
+            for n in inputs[node]:
+                if finish_times.get(n, 0.0) > start_time:
+                    start_time = finish_times[n]
+                    previous[node] = n
+            finish_times[node] = start_time + self.cook_times[node]
+
+        self.critical_path = []
+        self.critical_path_time = 0.0
+        if not finish_times:
+            return
+        node = max(finish_times, key=finish_times.get)
+        self.critical_path_time = finish_times[node]
+        while node is not None:
+            self.critical_path.insert(0, node)
+            node = previous.get(node, None)
 
 
 def _update_nodes(nodes):
-    for node in nodes:
-        if node.disabled():
-            continue
-        node.cook()
-        if node.has_error():
-            break
+    scheduler = CookScheduler(COOK_THREAD_COUNT)
+    scheduler.run(nodes)
+    return scheduler
 
 
 def update_node_down_stream(nodes):
     if not isinstance(nodes, list):
         nodes = [nodes]
-    _update_nodes(topological_sort_by_down(start_nodes=nodes))
-    # thread = CookThread()
-    # thread.start_nodes = nodes
-    # thread.start()
+    return _update_nodes(topological_sort_by_down(start_nodes=nodes))
 
 
 def update_nodes(nodes):
-    _update_nodes(topological_sort_by_down(all_nodes=nodes))
-    # thread = CookThread()
-    # thread.all_nodes = nodes
-    # thread.start()
+    return _update_nodes(topological_sort_by_down(all_nodes=nodes))
+
+
+_IMMUTABLE_TYPES = (int, float, complex, bool, str, bytes, frozenset, type(None), np.generic)
+
+
+def freeze_data(data):
+    """
+    Returns a read only version of the data without copying it if possible.
+    numpy arrays become non-writeable views, immutable built-in values are returned as is,
+    other objects are deep copied.
+
+    Args:
+        data(object).
+    """
+
+    if isinstance(data, np.ndarray):
+        view = data.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(data, _IMMUTABLE_TYPES):
+        return data
+    if isinstance(data, tuple) and all(isinstance(i, _IMMUTABLE_TYPES) for i in data):
+        return data
+    return copy.deepcopy(data)
+
+
+def get_data_nbytes(data):
+    """
+    Get a rough memory size of the node data.
+
+    Args:
+        data(object): node data.
+
+    Returns:
+        int: bytes.
+    """
+
+    if data is None:
+        return 0
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if hasattr(data, 'getMemorySize'):
+        return data.getMemorySize()
+    if isinstance(data, dict):
+        return sum(get_data_nbytes(v) for v in data.values())
+    if isinstance(data, (list, tuple)):
+        return sys.getsizeof(data) + sum(get_data_nbytes(v) for v in data)
+    return sys.getsizeof(data)
+
+
+def json_default(obj):
+    """
+    JSON default function for the node data, numpy arrays and scalars are saved as lists and numbers.
+
+    Args:
+        obj(object): object which is not JSON serializable.
+
+    Returns:
+        object: JSON serializable value.
+    """
+
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError('{} is not JSON serializable'.format(type(obj).__name__))
 
 
 def get_data_type(data_type):
@@ -48,6 +267,74 @@ def get_data_type(data_type):
     return data_type
 
 
+_cache_token_counter = itertools.count()
+
+
+def new_cache_token(node):
+    """
+    Returns a unique cache key which never matches any computed cache key.
+
+    Args:
+        node(AutoNode).
+    """
+
+    return '{}:{}'.format(node.id, next(_cache_token_counter))
+
+
+def _hash_data(h, data):
+    if isinstance(data, np.ndarray):
+        h.update('{}{}'.format(data.dtype, data.shape).encode('utf-8'))
+        h.update(np.ascontiguousarray(data).tobytes())
+    elif isinstance(data, dict):
+        h.update(b'{')
+        for key in sorted(data.keys(), key=str):
+            _hash_data(h, key)
+            _hash_data(h, data[key])
+        h.update(b'}')
+    elif isinstance(data, (list, tuple)):
+        h.update(b'[')
+        for item in data:
+            _hash_data(h, item)
+        h.update(b']')
+    else:
+        h.update(repr(data).encode('utf-8'))
+        h.update(b',')
+
+
+def get_file_signature(file_path):
+    """
+    Get the signature of a file for cache keys, it changes when the file is modified.
+
+    Args:
+        file_path(str): file path.
+
+    Returns:
+        tuple: (file path, modified time, size), None if the file does not exist.
+    """
+
+    try:
+        stat = os.stat(file_path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return file_path, stat.st_mtime_ns, stat.st_size
+
+
+def get_cache_key(*data):
+    """
+    Hash the data to a cache key.
+
+    Args:
+        data: any combination of dict, list, tuple, numpy.ndarray and built-in types.
+
+    Returns:
+        str: sha256 hex digest.
+    """
+
+    h = hashlib.sha256()
+    _hash_data(h, data)
+    return h.hexdigest()
+
+
 class CryptoColors(object):
     """
     Generate random color based on strings
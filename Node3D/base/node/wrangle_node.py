@@ -0,0 +1,310 @@
+from .script_node import ScriptNode
+from .kernel_cache import kernel_cache
+import numpy as np
+import traceback
+import numba
+import ast
+
+
+def _root_name(node):
+    while isinstance(node, (ast.Subscript, ast.Attribute, ast.Starred)):
+        node = node.value
+    return node.id if isinstance(node, ast.Name) else None
+
+
+def _element_indexed(node):
+    """
+    Returns True if the first subscript on the root name indexes the current element, such as pos[idx, 0].
+    """
+
+    sub = None
+    while isinstance(node, (ast.Subscript, ast.Attribute, ast.Starred)):
+        if isinstance(node, ast.Subscript):
+            sub = node
+        node = node.value
+    if sub is None or not isinstance(node, ast.Name):
+        return False
+    index = sub.slice
+    if isinstance(index, getattr(ast, 'Index', ())):
+        index = index.value
+    if isinstance(index, ast.Tuple) and index.elts:
+        index = index.elts[0]
+    return isinstance(index, ast.Name) and index.id == 'idx'
+
+
+def _write_targets(node):
+    if isinstance(node, (ast.Tuple, ast.List)):
+        for elt in node.elts:
+            yield from _write_targets(elt)
+    elif isinstance(node, (ast.Subscript, ast.Attribute, ast.Starred, ast.Name)):
+        yield node
+    else:
+        for child in ast.iter_child_nodes(node):
+            yield from _write_targets(child)
+
+
+def _attribute_usage(script, names):
+    """
+    Find the attributes used by a wrangle script.
+
+    Args:
+        script(str): wrangle script.
+        names(list[str]): attribute names of the geometry.
+
+    Returns:
+        tuple: (referenced attribute names in the order of names, set of written attribute names,
+        set of the written attribute names which are not only indexed by idx).
+    """
+
+    try:
+        tree = ast.parse(script)
+    except SyntaxError:
+        # the kernel reports the error, bind everything.
+        return list(names), set(names), set(names)
+
+    used = set()
+    written = set()
+    # names written at other elements than idx, or as a whole.
+    scattered = set()
+    # local names bound to an attribute or a row of it, such as p = pos[idx], writing them writes the attribute.
+    aliases = {}
+    # local names bound to the current element of an attribute.
+    element_aliases = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            used.add(node.id)
+        targets = []
+        # binding a local name doesn't write anything, augmented assignments modify arrays in place.
+        kinds = (ast.Subscript, ast.Attribute)
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+            root = _root_name(node.value)
+            if root is not None:
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        aliases[target.id] = root
+                        if _element_indexed(node.value):
+                            element_aliases.add(target.id)
+        elif isinstance(node, ast.AnnAssign):
+            targets = [node.target]
+        elif isinstance(node, ast.AugAssign):
+            targets = [node.target]
+            kinds = (ast.Subscript, ast.Attribute, ast.Name)
+        elif isinstance(node, ast.Call):
+            # arrays passed to functions or methods called on them may be modified in place,
+            # math functions and builtins such as min only take scalars.
+            if _root_name(node.func) != 'math' and not isinstance(node.func, ast.Name):
+                targets = list(node.args) + [kw.value for kw in node.keywords]
+            if isinstance(node.func, ast.Attribute):
+                targets.append(node.func.value)
+            kinds = (ast.Subscript, ast.Attribute, ast.Name)
+        for target in targets:
+            for sub in ast.walk(target):
+                if isinstance(sub, kinds):
+                    written.add(_root_name(sub))
+            for sub in _write_targets(target):
+                if isinstance(sub, kinds) and not _element_indexed(sub):
+                    scattered.add(_root_name(sub))
+    for name in list(scattered):
+        # writing a row of the current element is fine, such as p = pos[idx]; p[0] = 1.0.
+        chain = [name]
+        while name in aliases and name not in chain[:-1]:
+            name = aliases[name]
+            chain.append(name)
+        if not element_aliases.intersection(chain):
+            scattered.update(chain)
+        else:
+            scattered.discard(chain[0])
+    for name in list(written):
+        seen = set()
+        while name in aliases and name not in seen:
+            seen.add(name)
+            name = aliases[name]
+            written.add(name)
+    referenced = [name for name in names if name in used]
+    written = written.intersection(referenced)
+    return referenced, written, scattered.intersection(written)
+
+
+class WrangleNode(ScriptNode):
+    """
+    Base class of the nodes which compile the script into a numba kernel.
+    The script runs for every element of ATTRIB_CLASS in parallel, the element index is idx,
+    or runs once if ATTRIB_CLASS is 'detail'.
+    The elements are run serially if the script writes the attributes of other classes,
+    or writes an attribute at other indexes than idx.
+    Attributes of the classes in BIND are passed to the kernel by their names with the class prefix,
+    only the attributes and topology arrays referenced by the script are passed,
+    and only the written attributes are set back to the geometry.
+    Detail attributes are passed as 1d arrays, a float detail attribute is read and written by name[0].
+    """
+
+    # attribute class the kernel runs over.
+    ATTRIB_CLASS = 'vertex'
+
+    # {attribute class: argument name prefix} of the attributes passed to the kernel.
+    BIND = {'vertex': ''}
+
+    # topology arrays which can be used by the script:
+    # face_offsets, face_vertices: vertices of face i are face_vertices[face_offsets[i]:face_offsets[i + 1]].
+    # edge_vertices: shape = (ne, 2).
+    TOPOLOGY = ()
+
+    def __init__(self):
+        super(WrangleNode, self).__init__()
+        self.namespace['numba'] = numba
+        self.func = None
+
+    def kernelName(self):
+        return 'run_per_{}'.format(self.ATTRIB_CLASS)
+
+    def countName(self):
+        return '_{}_count'.format(self.ATTRIB_CLASS)
+
+    def getCount(self):
+        if self.ATTRIB_CLASS == 'vertex':
+            return self.geo.getNumVertexes()
+        elif self.ATTRIB_CLASS == 'face':
+            return self.geo.getNumFaces()
+        elif self.ATTRIB_CLASS == 'edge':
+            return self.geo.getNumEdges()
+        return 1
+
+    def getAttribData(self, attrib_class, name, write=False):
+        if attrib_class == 'vertex':
+            data = self.geo.getVertexAttribData(name)
+        elif attrib_class == 'face':
+            data = self.geo.getFaceAttribData(name)
+        elif attrib_class == 'edge':
+            data = self.geo.getEdgeAttribData(name)
+        else:
+            data = np.atleast_1d(np.array(self.geo.getDetailAttrib(name)))
+            if data.dtype.kind not in 'biuf':
+                return None
+            return data
+        if write:
+            # the kernel writes a copy which is set back, the data of a shared mesh is read-only.
+            data = np.array(data)
+        return data
+
+    def setAttribData(self, attrib_class, name, data):
+        if attrib_class == 'vertex':
+            self.geo.setVertexAttribData(name, data)
+        elif attrib_class == 'face':
+            self.geo.setFaceAttribData(name, data)
+        elif attrib_class == 'edge':
+            self.geo.setEdgeAttribData(name, data)
+        else:
+            value = data.tolist()
+            if np.ndim(self.geo.getDetailAttrib(name)) == 0:
+                value = value[0]
+            self.geo.setDetailAttrib(name, value)
+
+    def getTopology(self, names):
+        topology = {}
+        if 'face_offsets' in names or 'face_vertices' in names:
+            topology['face_offsets'], topology['face_vertices'] = self.geo.getFaceVertexCSR()
+        if 'edge_vertices' in names:
+            edges = self.geo.getEdges()
+            topology['edge_vertices'] = np.zeros((0, 2), dtype=np.int64) if edges is None else edges
+        return topology
+
+    def getBindings(self):
+        """
+        Returns the attributes and topology arrays referenced by the script.
+
+        Returns:
+            tuple: (list of (argument name, attribute class, attribute name), set of written argument names,
+            set of the written argument names which are not only indexed by idx),
+            attribute class is None for the topology arrays.
+        """
+
+        candidates = {}
+        for attrib_class, prefix in self.BIND.items():
+            for name in self.geo.attributeMap[attrib_class].keys():
+                arg = prefix + name
+                if arg.isidentifier() and arg not in candidates:
+                    candidates[arg] = (attrib_class, name)
+        for name in self.TOPOLOGY:
+            candidates[name] = (None, name)
+        names, written, scattered = _attribute_usage(self.get_property('Script').strip(), list(candidates.keys()))
+        return [(arg,) + candidates[arg] for arg in names], written, scattered
+
+    def getArguments(self, bindings, written):
+        args = []
+        data = []
+        topology = self.getTopology([name for arg, attrib_class, name in bindings if attrib_class is None])
+        for arg, attrib_class, name in bindings:
+            if attrib_class is None:
+                d = topology[name]
+            else:
+                d = self.getAttribData(attrib_class, name, arg in written)
+            if d is None:
+                continue
+            args.append(arg)
+            data.append(d)
+        if self.get_property('Depend Time'):
+            args.append('Frame')
+            data.append(self.get_frame())
+        if self.ATTRIB_CLASS != 'detail':
+            args.append(self.countName())
+            data.append(self.getCount())
+        return args, data
+
+    def isParallel(self, bindings, written, scattered):
+        """
+        Returns True if the kernel can run over the elements in parallel.
+        The elements only own the attributes of ATTRIB_CLASS at idx, the kernel runs serially if it writes
+        the other attributes or the topology arrays, such as the vertex attributes of a face wrangle,
+        or writes an attribute at other indexes, such as pos[idx + 1].
+
+        Args:
+            bindings(list): (argument name, attribute class, attribute name) returned by getBindings.
+            written(set): written argument names.
+            scattered(set): written argument names which are not only indexed by idx.
+        """
+
+        if self.ATTRIB_CLASS == 'detail' or scattered:
+            return False
+        return all(attrib_class == self.ATTRIB_CLASS for arg, attrib_class, name in bindings if arg in written)
+
+    def getPreCode(self, args, parallel=True):
+        if self.ATTRIB_CLASS == 'detail':
+            return 'def {}({}):\n    pass\n'.format(self.kernelName(), ', '.join(args))
+        return 'def {}({}):\n    for idx in {}({}):\n        pass\n'.format(
+            self.kernelName(), ', '.join(args), 'numba.prange' if parallel else 'range', self.countName())
+
+    def getSource(self, args, parallel=True):
+        preCode = self.getPreCode(args, parallel)
+        indent = '    ' if self.ATTRIB_CLASS == 'detail' else '        '
+        lines = self.get_property('Script').strip()
+        return preCode + '\n'.join(indent + line for line in lines.splitlines())
+
+    def updateCode(self, args, data, parallel=True):
+        if self.namespace['gp'] is None:
+            self.namespace['gp'] = self.graph
+        parallel = parallel and self.ATTRIB_CLASS != 'detail'
+        self.func = kernel_cache.get(self.getSource(args, parallel), self.kernelName(), data,
+                                     self.namespace, nopython=True, nogil=True, parallel=parallel)
+
+    def execute(self):
+        bindings, written, scattered = self.getBindings()
+        args, data = self.getArguments(bindings, written)
+        try:
+            # the kernel is cached by the script and the attributes, so only new signatures are compiled.
+            self.updateCode(args, data, self.isParallel(bindings, written, scattered))
+            self.func(*data)
+        except:
+            self.error(traceback.format_exc())
+            return
+        values = dict(zip(args, data))
+        for arg, attrib_class, name in bindings:
+            if arg in written and attrib_class is not None and arg in values:
+                self.setAttribData(attrib_class, name, values[arg])
+
+    def run(self):
+        if not self.copyData():
+            self.geo = None
+            return
+
+        self.execute()
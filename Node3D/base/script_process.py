@@ -0,0 +1,291 @@
+from ..opengl import Mesh
+from ..constants import SCRIPT_PROCESS_COUNT, COOK_THREAD_COUNT
+from multiprocessing import shared_memory, resource_tracker
+import multiprocessing
+import contextlib
+import atexit
+import threading
+import traceback
+import numpy as np
+import math
+import time
+import sys
+import os
+
+# byte alignment of the arrays in the shared memory block.
+_ALIGNMENT = 64
+
+
+def _open(name=None, size=0, track=True):
+    """
+    Create or attach a shared memory block.
+    The blocks are created by one process and removed by the other,
+    so the worker doesn't track them, or the resource tracker would remove them when the worker exits.
+    """
+
+    if track or os.name != 'posix':
+        return shared_memory.SharedMemory(name=name, create=name is None, size=size)
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, create=name is None, size=size, track=False)
+    shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+def _pack(arrays, track=True):
+    layout = {}
+    size = 0
+    for name, array in arrays.items():
+        layout[name] = (size, array.dtype.str, array.shape)
+        size += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    shm = _open(size=max(size, 1), track=track)
+    for name, array in arrays.items():
+        offset, dtype, shape = layout[name]
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)[...] = array
+    return shm, layout
+
+
+def _read_mesh(shm_name, layout, attribute_map, track=True):
+    shm = _open(shm_name, track=track)
+    try:
+        arrays = {name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+                  for name, (offset, dtype, shape) in layout.items()}
+        # openmesh copies the data, so the views are released before closing the block.
+        geo = Mesh.fromArrays(arrays, attribute_map)
+        arrays = None
+        return geo
+    finally:
+        try:
+            shm.close()
+        except BufferError:
+            # views are still referenced by a failed fromArrays, the block is closed when they are collected.
+            pass
+
+
+class _PipeWriter(object):
+    """
+    Send the printed text of the script to the main process.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def write(self, text):
+        if text:
+            self.conn.send(('print', text))
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class _ScriptNode(object):
+    """
+    Stands for the script node in the worker process.
+    """
+
+    def __init__(self, geo, frame, time_, properties):
+        self.geo = geo
+        self.messages = []
+        self._frame = frame
+        self._time = time_
+        self._properties = properties
+
+    def get_property(self, name):
+        return self._properties.get(name, None)
+
+    def get_frame(self):
+        return self._frame
+
+    def get_time(self):
+        return self._time
+
+    def error(self, message):
+        self.messages.append(('error', message))
+
+    def warning(self, message):
+        self.messages.append(('warning', message))
+
+
+def _run_task(conn, task):
+    try:
+        geo = _read_mesh(task['shm'], task['layout'], task['attribute_map'], False)
+        node = _ScriptNode(geo, task['frame'], task['time'], task['properties'])
+        namespace = {'node': node, 'np': np, 'gp': None, 'math': math}
+        with contextlib.redirect_stdout(_PipeWriter(conn)):
+            exec(task['script'], namespace)
+        if node.geo is None:
+            return 'done', None, node.messages
+        data = node.geo.toArrays()
+        if data is None:
+            return 'error', 'The output geometry has attributes which are not numpy arrays.'
+        arrays, attribute_map = data
+        shm, layout = _pack(arrays, False)
+        # the main process reads and removes the block.
+        shm.close()
+        return 'done', {'shm': shm.name, 'layout': layout, 'attribute_map': attribute_map}, node.messages
+    except:
+        return 'error', traceback.format_exc()
+
+
+def _worker_main(conn):
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        conn.send(_run_task(conn, task))
+
+
+class _Worker(object):
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), name='ScriptWorker')
+        self.process.daemon = True
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join(1)
+        self.conn.close()
+
+
+class ScriptProcessPool(object):
+    """
+    Run the scripts of the script nodes in worker processes,
+    so a slow script neither blocks the application nor holds the GIL.
+    Script nodes running out of process are parallel safe, so the cook threads run their scripts concurrently.
+    The geometry arrays are passed through shared memory blocks instead of pickling,
+    and the printed text of the script is sent back while it runs.
+    A worker running out of time or cancelled is terminated, and a new worker is started by the next script.
+    """
+
+    def __init__(self, max_workers=SCRIPT_PROCESS_COUNT):
+        self.max_workers = max_workers or max(1, min(COOK_THREAD_COUNT, os.cpu_count() or 1))
+        self._context = multiprocessing.get_context('spawn')
+        self._idle = []
+        self._count = 0
+        self._condition = threading.Condition()
+
+    def _acquire(self):
+        with self._condition:
+            while not self._idle and self._count >= self.max_workers:
+                self._condition.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._count += 1
+        try:
+            return _Worker(self._context)
+        except:
+            self._release(None)
+            raise
+
+    def _release(self, worker):
+        with self._condition:
+            if worker is not None:
+                self._idle.append(worker)
+            else:
+                self._count -= 1
+            self._condition.notify()
+
+    def run(self, script, geo, frame=None, time_=None, properties=None, timeout=0, cancelled=None):
+        """
+        Run the script in a worker process, the script gets the geometry by node.geo.
+
+        Args:
+            script(str): python script.
+            geo(Mesh): input geometry, all attributes must be numpy arrays.
+            frame(int): returned by node.get_frame in the script.
+            time_(float): returned by node.get_time in the script.
+            properties(dict): returned by node.get_property in the script.
+            timeout(float): seconds before the script is stopped, 0 means no limit.
+            cancelled(function): returns whether the script should be stopped.
+
+        Returns:
+            tuple: output geometry, list of (message level, message) reported by the script.
+
+        Raises:
+            TimeoutError: the script runs out of time.
+            RuntimeError: the script fails or is cancelled.
+        """
+
+        data = geo.toArrays()
+        if data is None:
+            raise RuntimeError('The input geometry has attributes which are not numpy arrays.')
+        arrays, attribute_map = data
+        shm, layout = _pack(arrays)
+        try:
+            task = {'script': script, 'shm': shm.name, 'layout': layout, 'attribute_map': attribute_map,
+                    'frame': frame, 'time': time_, 'properties': properties or {}}
+            result = self._send(task, timeout, cancelled)
+        finally:
+            shm.close()
+            shm.unlink()
+
+        if result[0] == 'error':
+            raise RuntimeError(result[1])
+        output, messages = result[1], result[2]
+        if output is None:
+            return None, messages
+        try:
+            geo = _read_mesh(output['shm'], output['layout'], output['attribute_map'])
+        finally:
+            _unlink(output['shm'])
+        return geo, messages
+
+    def _send(self, task, timeout, cancelled):
+        worker = self._acquire()
+        deadline = None if not timeout else time.monotonic() + timeout
+        try:
+            worker.conn.send(task)
+            while True:
+                wait = 0.05
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0:
+                        raise TimeoutError('The script is stopped after {} seconds.'.format(timeout))
+                if cancelled is not None and cancelled():
+                    raise RuntimeError('The script is cancelled.')
+                if not worker.conn.poll(wait):
+                    if not worker.process.is_alive():
+                        raise RuntimeError('The script process exited with code {}.'.format(worker.process.exitcode))
+                    continue
+                message = worker.conn.recv()
+                if message[0] == 'print':
+                    sys.stdout.write(message[1])
+                    continue
+                break
+        except BaseException:
+            worker.kill()
+            self._release(None)
+            raise
+        self._release(worker)
+        return message
+
+    def shutdown(self):
+        """
+        Stop the idle workers, workers running scripts stop after the scripts finish.
+        """
+
+        with self._condition:
+            workers, self._idle = self._idle, []
+            self._count -= len(workers)
+        for worker in workers:
+            with contextlib.suppress(OSError):
+                worker.conn.send(None)
+            worker.process.join(1)
+            worker.conn.close()
+
+
+def _unlink(shm_name):
+    with contextlib.suppress(FileNotFoundError):
+        shm = shared_memory.SharedMemory(name=shm_name)
+        shm.close()
+        shm.unlink()
+
+
+script_pool = ScriptProcessPool()
+atexit.register(script_pool.shutdown)
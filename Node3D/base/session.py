@@ -0,0 +1,139 @@
+from .node.utils import json_default
+from .node import AutoNode, session_outputs
+import numpy as np
+import json
+
+# extension of the binary session files.
+BINARY_SESSION_EXT = '.n3d'
+
+# flat numeric list properties with more items are saved as arrays,
+# nested numeric lists such as matrices and the lists of ramps are saved as arrays at any size.
+ARRAY_PROPERTY_SIZE = 64
+
+
+def _to_array(value, min_size):
+    if not isinstance(value, (list, tuple)) or not value:
+        return None
+    try:
+        array = np.asarray(value)
+    except ValueError:
+        return None
+    if array.dtype.kind not in 'if':
+        return None
+    if array.ndim < 2 and len(value) < min_size:
+        return None
+    # only lists which are restored exactly, mixed int and float items are kept in JSON.
+    if json.dumps(array.tolist()) != json.dumps(value, default=json_default):
+        return None
+    return array
+
+
+def _encode_value(value, arrays, min_size=ARRAY_PROPERTY_SIZE):
+    array = _to_array(value, min_size)
+    if array is not None:
+        member = 'p{}'.format(len(arrays))
+        arrays[member] = array
+        return {'__array__': member}
+    if isinstance(value, (list, tuple)):
+        # ramps mix their point lists with the interpolation name.
+        return [_encode_value(v, arrays, 0) for v in value]
+    return value
+
+
+def _decode_value(value, npz_file):
+    if isinstance(value, dict) and '__array__' in value:
+        return npz_file[value['__array__']].tolist()
+    if isinstance(value, list):
+        return [_decode_value(v, npz_file) for v in value]
+    return value
+
+
+def _encode_properties(data, arrays):
+    for n_data in data.get('nodes', {}).values():
+        # the custom properties may be the dict of the node model, never change it.
+        custom = dict(n_data.get('custom', {}))
+        for name, value in custom.items():
+            custom[name] = _encode_value(value, arrays)
+        n_data['custom'] = custom
+        if 'sub_graph' in n_data:
+            _encode_properties(n_data['sub_graph'], arrays)
+
+
+def _decode_properties(data, npz_file):
+    for n_data in data.get('nodes', {}).values():
+        custom = n_data.get('custom', {})
+        for name, value in custom.items():
+            custom[name] = _decode_value(value, npz_file)
+        if 'sub_graph' in n_data:
+            _decode_properties(n_data['sub_graph'], npz_file)
+
+
+def _node_outputs(nodes, arrays):
+    outputs = {}
+    for node in nodes:
+        if not isinstance(node, AutoNode) or not node.DISK_CACHE:
+            continue
+        if not node._cook_lock.acquire(False):
+            continue
+        try:
+            cache_key = node.compute_cache_key()
+            if cache_key is None or cache_key != node._cache_key or node._evicted or node.has_error():
+                continue
+            data = node._disk_output()
+            if data is None:
+                continue
+            info = json.loads(json.dumps(data[1], default=json_default))
+        except (TypeError, ValueError):
+            continue
+        finally:
+            node._cook_lock.release()
+        members = {}
+        for name, array in data[0].items():
+            members[name] = 'o{}'.format(len(arrays))
+            arrays[members[name]] = array
+        outputs[cache_key] = {'arrays': members, 'info': info}
+    return outputs
+
+
+def write_binary_session(graph, file_path, serialized_data):
+    """
+    Write the session as an uncompressed npz file.
+    The serialized session is saved as a JSON string, numeric list properties such as ramps and matrices
+    and the cooked outputs of the nodes which use the disk cache are saved as numpy arrays.
+
+    Args:
+        graph(NodeGraphQt.NodeGraph or HeadlessGraph): node graph.
+        file_path(str): session file path.
+        serialized_data(dict): serialized session.
+    """
+
+    arrays = {}
+    _encode_properties(serialized_data, arrays)
+    serialized_data['outputs'] = _node_outputs(graph.all_nodes(), arrays)
+    session = json.dumps(serialized_data, default=json_default, separators=(',', ':'))
+    with open(file_path, 'wb') as file_out:
+        np.savez(file_out, __session__=np.frombuffer(session.encode('utf-8'), dtype=np.uint8), **arrays)
+
+
+def read_binary_session(graph, file_path):
+    """
+    Read the session saved by write_binary_session.
+    The file is kept open, stored node outputs are read when the nodes are cooked.
+
+    Args:
+        graph(NodeGraphQt.NodeGraph or HeadlessGraph): node graph.
+        file_path(str): session file path.
+
+    Returns:
+        dict: serialized session.
+    """
+
+    npz_file = np.load(file_path, allow_pickle=False)
+    try:
+        layout_data = json.loads(npz_file['__session__'].tobytes().decode('utf-8'))
+        _decode_properties(layout_data, npz_file)
+    except Exception:
+        npz_file.close()
+        raise
+    session_outputs.set(npz_file, layout_data.pop('outputs', {}))
+    return layout_data
@@ -1,3 +1,5 @@
+import os
+
 WITH_CUDA = False
 try:
     import cupy
@@ -16,4 +18,60 @@ class NodeCategory(object):
 class NodeMessageLevel(object):
     NONE = 0
     WARNING = 1
-    ERROR = 2
\ No newline at end of file
+    ERROR = 2
+
+# number of threads to cook independent node branches, 1 means cook the nodes one by one.
+# only nodes with AutoNode.PARALLEL_COOK share the threads.
+COOK_THREAD_COUNT = int(os.environ.get('NODE3D_COOK_THREADS', os.cpu_count() or 1))
+
+# number of worker processes running the scripts of the script nodes out of process,
+# 0 uses the cook thread count since every cook thread runs one script at a time.
+SCRIPT_PROCESS_COUNT = int(os.environ.get('NODE3D_SCRIPT_PROCESSES', 0))
+
+# default seconds before a script running out of process is stopped, 0 means no limit.
+SCRIPT_TIMEOUT = float(os.environ.get('NODE3D_SCRIPT_TIMEOUT', 0))
+
+# memory budget in MB of the cooked outputs of time dependent nodes.
+FRAME_CACHE_SIZE = int(os.environ.get('NODE3D_FRAME_CACHE_MB', 2048)) * 1024 * 1024
+
+# memory budget in MB of the cooked outputs of all nodes, least recently used outputs are released.
+OUTPUT_MEMORY_SIZE = int(os.environ.get('NODE3D_OUTPUT_MEMORY_MB', 8192)) * 1024 * 1024
+
+# run the garbage collector after this many bytes of node outputs are released.
+GC_THRESHOLD = 256 * 1024 * 1024
+
+# folder of the cooked outputs kept across sessions, empty string disables the disk cache.
+DISK_CACHE_PATH = os.environ.get('NODE3D_DISK_CACHE', os.path.join(os.path.expanduser('~'), '.node3d', 'cache'))
+
+# size limit in MB of the disk cache, least recently used files are removed.
+DISK_CACHE_SIZE = int(os.environ.get('NODE3D_DISK_CACHE_MB', 10240)) * 1024 * 1024
+
+# increase it when the compiled kernels change in a way numba can not detect, old caches are ignored.
+KERNEL_CACHE_VERSION = 1
+
+# folder of the compiled numba kernels, set as NUMBA_CACHE_DIR when Node3D is imported.
+KERNEL_CACHE_PATH = os.path.join(
+    os.environ.get('NODE3D_KERNEL_CACHE', os.path.join(os.path.expanduser('~'), '.node3d', 'kernels')),
+    'v{}'.format(KERNEL_CACHE_VERSION))
+
+# number of compiled wrangle kernels kept in memory, least recently used kernels are removed.
+WRANGLE_KERNEL_COUNT = int(os.environ.get('NODE3D_WRANGLE_KERNELS', 64))
+
+# folder of the generated wrangle kernels compiled with the numba cache, empty string keeps them in memory only.
+WRANGLE_KERNEL_PATH = os.environ.get('NODE3D_WRANGLE_CACHE', os.path.join(KERNEL_CACHE_PATH, 'wrangle'))
+
+# number of wrangle kernels kept in the wrangle kernel folder, least recently used kernels are removed.
+WRANGLE_KERNEL_FILES = int(os.environ.get('NODE3D_WRANGLE_KERNEL_FILES', 1024))
+
+# manifest of the shipped node classes, the node modules are imported when a node type is first created.
+NODE_MANIFEST_PATH = os.environ.get('NODE3D_NODE_MANIFEST',
+                                    os.path.join(os.path.expanduser('~'), '.node3d', 'node_manifest.json'))
+
+# save session files without indents, which is faster for large graphs.
+COMPACT_SESSION = os.environ.get('NODE3D_COMPACT_SESSION', '0') == '1'
+
+# seconds after exiting a sub graph before the views of its children are deleted, negative keeps them.
+VIEW_RELEASE_TIME = float(os.environ.get('NODE3D_VIEW_RELEASE_SECONDS', 60))
+
+# number of frames cooked ahead of the play head while the timeline is playing, 0 disables prefetching.
+PREFETCH_FRAMES = int(os.environ.get('NODE3D_PREFETCH_FRAMES', 10))
@@ -8,7 +8,6 @@ class GetAttributeData(GeometryNode):
 
     def __init__(self):
         super(GetAttributeData, self).__init__(False)
-        self.create_property('out data', None)
         self.add_input('geo', GeometryNode)
         self.add_output('out data', np.ndarray)
         self.set_parameters([{'name': 'Attribute Class', 'type': 'list', 'value': 'vertex',
@@ -16,15 +15,12 @@ class GetAttributeData(GeometryNode):
                              {'name': 'Attribute Name', 'type': 'listText'}])
 
     def get_data(self, port):
-        try:
-            return self.get_property('out data')
-        except:
-            return None
+        return self.get_output_data('out data')
 
     def run(self):
         geo = self.get_input_geometry_ref(0)
         if geo is None:
-            self.set_property('out data', None)
+            self.set_output_data('out data', None)
             self.error('Please input a geometry')
             return
 
@@ -33,7 +29,7 @@ class GetAttributeData(GeometryNode):
 
         attrib_name = self.get_property('Attribute Name')
         if not geo.hasAttribute(attrib_class, attrib_name):
-            self.set_property('out data', None)
+            self.set_output_data('out data', None)
             return
 
         if attrib_class == 'vertex':
@@ -45,7 +41,7 @@ class GetAttributeData(GeometryNode):
         elif attrib_class == 'detail':
             data = geo.getDetailAttrib(attrib_name)
 
-        self.set_property('out data', data)
+        self.set_output_data('out data', data)
 
 
 class SetAttributeData(GeometryNode):
@@ -8,6 +8,7 @@ import igl
 class GaussianCurvature(GeometryNode):
     __identifier__ = 'Calculate'
     NODE_NAME = 'Gaussian_Curvature'
+    PARALLEL_COOK = True
 
     def __init__(self):
         super(GaussianCurvature, self).__init__()
@@ -62,6 +63,8 @@ class AttributeBlur(GeometryNode):
 class DistanceAlongSurface(GeometryNode):
     __identifier__ = 'Calculate'
     NODE_NAME = 'Distance_Along_Surface'
+    DISK_CACHE = True
+    PARALLEL_COOK = True
 
     def __init__(self):
         super(DistanceAlongSurface, self).__init__()
@@ -96,6 +99,7 @@ class DistanceAlongSurface(GeometryNode):
 class Harmonic(GeometryNode):
     __identifier__ = 'uv'
     NODE_NAME = 'Harmonic'
+    PARALLEL_COOK = True
 
     def __init__(self):
         super(Harmonic, self).__init__()
@@ -127,6 +131,7 @@ class Harmonic(GeometryNode):
 class ARAP(GeometryNode):
     __identifier__ = 'uv'
     NODE_NAME = 'ARAP'
+    PARALLEL_COOK = True
 
     def __init__(self):
         super(ARAP, self).__init__()
@@ -165,6 +170,8 @@ class ARAP(GeometryNode):
 class AmbientOcclusion(GeometryNode):
     __identifier__ = 'Calculate'
     NODE_NAME = 'Ambient_Occlusion'
+    DISK_CACHE = True
+    PARALLEL_COOK = True
 
     def __init__(self):
         super(AmbientOcclusion, self).__init__()
@@ -227,6 +234,7 @@ class Measure(GeometryNode):
 class WindingNumber(GeometryNode):
     __identifier__ = 'Calculate'
     NODE_NAME = 'Winding_Number'
+    PARALLEL_COOK = True
 
     def __init__(self):
         super(WindingNumber, self).__init__()
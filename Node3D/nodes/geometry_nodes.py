@@ -1,7 +1,7 @@
 from Node3D.base.node import GeometryNode
+from Node3D.base.node.utils import get_file_signature
 from Node3D.opengl import Mesh
 from Node3D.vendor.NodeGraphQt.constants import *
-import openmesh
 import igl
 import numpy as np
 import pyassimp
@@ -36,6 +36,7 @@ import_flags = aiProcessPreset_TargetRealtime_MaxQuality = ( \
 class File(GeometryNode):
     __identifier__ = 'Geometry'
     NODE_NAME = 'File'
+    DISK_CACHE = True
 
     def __init__(self):
         super(File, self).__init__()
@@ -77,6 +78,9 @@ class File(GeometryNode):
 
         pyassimp.release(scene)
 
+    def cache_dependencies(self):
+        return get_file_signature(self.get_property("file"))
+
     def run(self):
         file = self.get_property("file")
         self.geo = None
@@ -104,6 +108,8 @@ class Smooth(GeometryNode):
 class Subdivide(GeometryNode):
     __identifier__ = 'Geometry'
     NODE_NAME = 'Subdivide'
+    DISK_CACHE = True
+    PARALLEL_COOK = True
 
     def __init__(self):
         super(Subdivide, self).__init__()
@@ -161,7 +167,7 @@ class CollapseSmallTriangles(GeometryNode):
 
         v, f = igl.collapse_small_triangles(v, f, 0.1)
 
-        self.geo._mesh = openmesh.PolyMesh()
+        self.geo = Mesh()
         self.geo.addVertices(v)
         self.geo.addFaces(f)
 
@@ -169,6 +175,7 @@ class CollapseSmallTriangles(GeometryNode):
 class Scatter(GeometryNode):
     __identifier__ = 'Geometry'
     NODE_NAME = 'Scatter'
+    PARALLEL_COOK = True
 
     def __init__(self):
         super(Scatter, self).__init__()
@@ -36,7 +36,7 @@ class Face(GeometryNode):
 
     def run(self):
         self.geo = Mesh()
-        geos = [port.node().get_data(port) for port in self.get_port(0).connected_ports()]
+        geos = [self._slot_node(port.node()).get_data(port) for port in self.get_port(0).connected_ports()]
         points = []
         pscales = []
         colors = []
@@ -254,6 +254,9 @@ class Color(GeometryNode):
 
         self.add_input("geo", GeometryNode)
 
+    def is_cacheable(self):
+        return not self.get_property("Random")
+
     def run(self):
         if not self.copyData():
             return
@@ -1,4 +1,5 @@
 from Node3D.base.node import ImageNode
+from Node3D.base.node.utils import get_file_signature
 from Node3D.base.image_process import gamma_cpu, gamma_gpu
 from Node3D.constants import WITH_CUDA
 import cv2
@@ -211,6 +212,7 @@ class File(ImageNode):
 
     # set the initial default node name.
     NODE_NAME = 'File Import'
+    DISK_CACHE = True
 
     def __init__(self):
         super(File, self).__init__()
@@ -223,6 +225,9 @@ class File(ImageNode):
         # self.add_combo_menu('color space', 'color space', ['srgb', 'linear'])
         # # self.
 
+    def cache_dependencies(self):
+        return get_file_signature(self.get_property('File'))
+
     def run(self):
         self.image = None
         file_path = self.get_property('File')
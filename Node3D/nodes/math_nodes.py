@@ -50,13 +50,13 @@ class DataViewerNode(AutoNode):
     __identifier__ = 'Math'
     NODE_NAME = 'Data View'
     NODE_CATEGORY = NodeCategory.CALCULATE
+    READ_ONLY_INPUTS = True
 
     def __init__(self):
         super(DataViewerNode, self).__init__()
         self.add_input('in data')
         self.add_text_input('data', 'Data Viewer', multi_line=True)
         self.add_output("out")
-        self.create_property("out", None)
 
     def run(self):
         value = self.get_input_data(0)
@@ -64,40 +64,41 @@ class DataViewerNode(AutoNode):
             self.set_property('data', "{:.10f}".format(value))
         else:
             self.set_property('data', str(value))
-        self.set_property('out', value)
+        self.set_output_data('out', value)
 
 
 class Time(AutoNode):
     __identifier__ = 'Math'
     NODE_NAME = 'Time'
     NODE_CATEGORY = NodeCategory.CALCULATE
+    CACHE_ENABLED = False
 
     def __init__(self):
         super(Time, self).__init__()
         self.add_output("Frame", int)
         self.add_output("Time", float)
-        self.create_property("Frame", 0)
-        self.create_property("Time", 0.0)
+        self.set_output_data("Frame", 0)
+        self.set_output_data("Time", 0.0)
 
     def set_graph(self, graph):
         super(Time, self).set_graph(graph)
         self.graph.master.timeline.frameChanged.connect(self.tick)
 
     def tick(self, frame):
-        self.set_property("Frame", frame)
-        self.set_property("Time", float(frame) / self.graph.master.timeline.fps)
-        self.cookNextNode()
+        self.set_output_data("Frame", frame)
+        self.set_output_data("Time", float(frame) / self.graph.master.timeline.fps)
+        self.update_stream()
 
 
 class Sin(AutoNode):
     __identifier__ = 'Math'
     NODE_NAME = 'Sin'
     NODE_CATEGORY = NodeCategory.CALCULATE
+    READ_ONLY_INPUTS = True
 
     def __init__(self):
         super(Sin, self).__init__()
         self.add_output('out', np.ndarray)
-        self.create_property('out', None)
         self.add_input('data', np.ndarray)
 
     def run(self):
@@ -105,18 +106,18 @@ class Sin(AutoNode):
         if data is None:
             self.error("No enough input")
             return
-        self.set_property('out', np.sin(data))
+        self.set_output_data('out', np.sin(data))
 
 
 class Add(AutoNode):
     __identifier__ = 'Math'
     NODE_NAME = 'Add'
     NODE_CATEGORY = NodeCategory.CALCULATE
+    READ_ONLY_INPUTS = True
 
     def __init__(self):
         super(Add, self).__init__()
         self.add_output('out', np.ndarray)
-        self.create_property('out', None)
         self.add_input('A', np.ndarray)
         self.add_input('B', None)
 
@@ -127,18 +128,18 @@ class Add(AutoNode):
         if a is None or b is None:
             self.error("No enough input")
             return
-        self.set_property('out', np.add(a, b))
+        self.set_output_data('out', np.add(a, b))
 
 
 class Subtract(AutoNode):
     __identifier__ = 'Math'
     NODE_NAME = 'Subtract'
     NODE_CATEGORY = NodeCategory.CALCULATE
+    READ_ONLY_INPUTS = True
 
     def __init__(self):
         super(Subtract, self).__init__()
         self.add_output('out', np.ndarray)
-        self.create_property('out', None)
         self.add_input('A', np.ndarray)
         self.add_input('B', None)
 
@@ -149,18 +150,18 @@ class Subtract(AutoNode):
         if a is None or b is None:
             self.error("No enough input")
             return
-        self.set_property('out', np.subtract(a, b))
+        self.set_output_data('out', np.subtract(a, b))
 
 
 class Multiply(AutoNode):
     __identifier__ = 'Math'
     NODE_NAME = 'Multiply'
     NODE_CATEGORY = NodeCategory.CALCULATE
+    READ_ONLY_INPUTS = True
 
     def __init__(self):
         super(Multiply, self).__init__()
         self.add_output('out', np.ndarray)
-        self.create_property('out', None)
         self.add_input('A', np.ndarray)
         self.add_input('B', None)
 
@@ -171,18 +172,18 @@ class Multiply(AutoNode):
         if a is None or b is None:
             self.error("No enough input")
             return
-        self.set_property('out', np.multiply(a, b))
+        self.set_output_data('out', np.multiply(a, b))
 
 
 class Divide(AutoNode):
     __identifier__ = 'Math'
     NODE_NAME = 'Divide'
     NODE_CATEGORY = NodeCategory.CALCULATE
+    READ_ONLY_INPUTS = True
 
     def __init__(self):
         super(Divide, self).__init__()
         self.add_output('out', np.ndarray)
-        self.create_property('out', None)
         self.add_input('A', np.ndarray)
         self.add_input('B', None)
 
@@ -193,18 +194,19 @@ class Divide(AutoNode):
         if a is None or b is None:
             self.error("No enough input")
             return
-        self.set_property('out', np.divide(a, b))
+        self.set_output_data('out', np.divide(a, b))
 
 
 class Random(AutoNode):
     __identifier__ = 'Math'
     NODE_NAME = 'Random'
     NODE_CATEGORY = NodeCategory.CALCULATE
+    CACHE_ENABLED = False
+    READ_ONLY_INPUTS = True
 
     def __init__(self):
         super(Random, self).__init__()
         self.add_output('out', np.ndarray)
-        self.create_property('out', None)
         self.add_input('data', np.ndarray)
 
     def run(self):
@@ -212,7 +214,7 @@ class Random(AutoNode):
         if a is None:
             self.error("No enough input")
             return
-        self.set_property('out', np.random.random(a.shape))
+        self.set_output_data('out', np.random.random(a.shape))
 
 
 class VectorSplit(AutoNode):
@@ -223,18 +225,19 @@ class VectorSplit(AutoNode):
     __identifier__ = 'Math'
     NODE_NAME = 'Vector Split'
     NODE_CATEGORY = NodeCategory.CALCULATE
+    READ_ONLY_INPUTS = True
 
     def __init__(self):
         super(VectorSplit, self).__init__()
 
         self.add_output('x')
-        self.create_property("x", 0.0)
+        self.set_output_data('x', 0.0)
         self.add_output('y')
-        self.create_property("y", 0.0)
+        self.set_output_data('y', 0.0)
         self.add_output('z')
-        self.create_property("z", 0.0)
+        self.set_output_data('z', 0.0)
         self.add_output('w')
-        self.create_property("w", 0.0)
+        self.set_output_data('w', 0.0)
 
         self.add_input("in vector", list)
         self.map = {0: "x", 1: "y", 2: "z", 3: "w"}
@@ -246,7 +249,7 @@ class VectorSplit(AutoNode):
         for index, data in enumerate(value):
             if index > 3:
                 return
-            self.set_property(self.map[index], data)
+            self.set_output_data(self.map[index], data)
 
 
 class VectorMaker(AutoNode):
@@ -257,12 +260,12 @@ class VectorMaker(AutoNode):
     __identifier__ = 'Math'
     NODE_NAME = 'Vector Maker'
     NODE_CATEGORY = NodeCategory.CALCULATE
+    READ_ONLY_INPUTS = True
 
     def __init__(self):
         super(VectorMaker, self).__init__()
 
         self.add_output('out', list)
-        self.create_property("out", None)
 
         self.add_input("x", float)
         self.add_input("y", float)
@@ -276,7 +279,7 @@ class VectorMaker(AutoNode):
             if data is not None:
                 result.append(data)
 
-        self.set_property("out", result)
+        self.set_output_data('out', result)
 
 
 class DataConvect(AutoNode):
@@ -287,12 +290,12 @@ class DataConvect(AutoNode):
     __identifier__ = 'Math'
     NODE_NAME = 'Data Convect'
     NODE_CATEGORY = NodeCategory.CALCULATE
+    READ_ONLY_INPUTS = True
 
     def __init__(self):
         super(DataConvect, self).__init__()
 
         self.add_output('out')
-        self.create_property("out", None)
         self.add_input("in data")
 
         items = ["all to int", "all to float", "all to string", "eval string", "all to list"]
@@ -311,7 +314,7 @@ class DataConvect(AutoNode):
                 data = eval(self.get_input_data(0))
             elif method == "all to list":
                 data = list(self.get_input_data(0))
-            self.set_property("out", data)
+            self.set_output_data('out', data)
         except Exception as error:
             self.error(error)
 
@@ -394,11 +397,11 @@ class BoolInputNode(AutoNode):
     def __init__(self):
         super(BoolInputNode, self).__init__()
         self.add_output('out', bool)
-        self.create_property('out', True)
+        self.set_output_data('out', True)
         self.add_combo_menu('combo', 'Bool value', items=['True', 'False'])
 
     def run(self):
-        self.set_property('out', eval(self.get_property('combo')))
+        self.set_output_data('out', eval(self.get_property('combo')))
 
 
 class IfNode(AutoNode):
@@ -409,6 +412,7 @@ class IfNode(AutoNode):
     __identifier__ = 'Math'
     NODE_NAME = 'If'
     NODE_CATEGORY = NodeCategory.CALCULATE
+    READ_ONLY_INPUTS = True
 
     def __init__(self):
         super(IfNode, self).__init__()
@@ -416,7 +420,6 @@ class IfNode(AutoNode):
         self._then = self.add_input('then')
         self._else = self.add_input('else')
         self.add_output('out')
-        self.create_property('out', None)
 
     def run(self):
         if self.get_input_data(self.condition):
@@ -424,7 +427,7 @@ class IfNode(AutoNode):
         else:
             result = self.get_input_data(self._else)
 
-        self.set_property('out', result)
+        self.set_output_data('out', result)
 
 
 class BooleanNode(AutoNode):
@@ -436,6 +439,7 @@ class BooleanNode(AutoNode):
 
     NODE_NAME = 'Boolean'
     NODE_CATEGORY = NodeCategory.CALCULATE
+    READ_ONLY_INPUTS = True
 
     logics = {'and': 'a and b',
               'or': 'a or b',
@@ -447,7 +451,6 @@ class BooleanNode(AutoNode):
         self.a = self.add_input('a', bool)
         self.b = self.add_input('b', bool)
         self.add_output('out', bool)
-        self.create_property('out', None)
         self.add_combo_menu('funcs',
                             'Functions',
                             items=list(self.logics.keys()),
@@ -455,7 +458,7 @@ class BooleanNode(AutoNode):
 
         self.func = self.logics['and']
         # switch math function type
-        self.view.widgets['funcs'].value_changed.connect(self.addFunction)
+        self.connect_widget('funcs', self.addFunction)
 
     def addFunction(self, prop, func):
         """
@@ -476,4 +479,4 @@ class BooleanNode(AutoNode):
             self.error("No inputs!")
             return
 
-        self.set_property('out', eval(self.func))
+        self.set_output_data('out', eval(self.func))
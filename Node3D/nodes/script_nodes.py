@@ -1,16 +1,41 @@
-from Node3D.base.node import ScriptNode
+from Node3D.base.node import ScriptNode, WrangleNode
+from Node3D.base.script_process import script_pool
 from Node3D.opengl import Mesh
-import numba
+from Node3D.constants import SCRIPT_TIMEOUT
+from Node3D.vendor.NodeGraphQt.constants import NODE_PROP_QCHECKBOX, NODE_PROP_FLOAT
 from collections import namedtuple
 import traceback
+import threading
+import pickle
 
 
 class Python(ScriptNode):
+    """
+    Run the script with the node as node and the graph as gp.
+    If Out Of Process is set, the script runs in a worker process with a copy of the geometry as node.geo,
+    it can use node.get_property, node.get_frame and node.get_time, but not the graph.
+    """
+
     __identifier__ = 'Script'
     NODE_NAME = 'Python'
 
     def __init__(self):
         super(Python, self).__init__()
+        self.create_property('Out Of Process', False, widget_type=NODE_PROP_QCHECKBOX)
+        self.create_property('Timeout', SCRIPT_TIMEOUT, widget_type=NODE_PROP_FLOAT)
+        self._interrupted = threading.Event()
+
+    def _frame_slot(self, frame, slots):
+        slot = super(Python, self)._frame_slot(frame, slots)
+        slot._interrupted = threading.Event()
+        return slot
+
+    def interrupt(self):
+        self._interrupted.set()
+
+    def is_parallel_safe(self):
+        # scripts running in the worker processes only change the output of the node.
+        return bool(self.get_property('Out Of Process'))
 
     def execute(self):
         if self.namespace['gp'] is None:
@@ -20,80 +45,99 @@ class Python(ScriptNode):
         except:
             self.error(traceback.format_exc())
 
+    def get_script_properties(self):
+        properties = {}
+        for name, value in self.model.custom_properties.items():
+            try:
+                pickle.dumps(value)
+            except Exception:
+                continue
+            properties[name] = value
+        return properties
+
+    def execute_out_of_process(self):
+        try:
+            frame, time_ = self.get_frame(), self.get_time()
+        except AttributeError:
+            frame, time_ = None, None
+        try:
+            geo, messages = script_pool.run(self.get_property('Script').strip(), self.geo, frame, time_,
+                                            self.get_script_properties(), timeout=self.get_property('Timeout'),
+                                            cancelled=self._interrupted.is_set)
+        except Exception as e:
+            self.error(str(e))
+            return
+        self.geo = geo
+        for level, message in messages:
+            if level == 'error':
+                self.error(message)
+            else:
+                self.warning(message)
+
     def run(self):
+        # an interrupt of the last cook must not stop this one.
+        self._interrupted.clear()
         if not self.copyData():
             self.geo = Mesh()
 
-        self.execute()
+        if self.get_property('Out Of Process'):
+            self.execute_out_of_process()
+        else:
+            self.execute()
+
 
+class VertexWrangle(WrangleNode):
+    """
+    Run the script for every vertex in parallel.
+    Vertex attributes are bound by their names and the vertex index is idx,
+    vertices are run serially if the script writes an attribute at other indexes than idx.
+    """
 
-class VertexWrangle(ScriptNode):
     __identifier__ = 'Script'
     NODE_NAME = 'Vertex_Wrangle'
+    ATTRIB_CLASS = 'vertex'
+    BIND = {'vertex': ''}
 
-    def __init__(self):
-        super(VertexWrangle, self).__init__()
-        # attribs = {}
-        self.preCode = '''def run_per_vertex({}, _vertex_count):
-    for idx in range(_vertex_count):
-        pass
-'''
-        self.func = None
-
-    def getAllVertexAttributes(self):
-        dt = self.get_property('Depend Time')
-        names = list(self.geo.attributeMap["vertex"].keys())
-
-        data = []
-        for attrib_name in names:
-            d = self.geo.getVertexAttribData(attrib_name)
-            data.append(d)
-        if dt:
-            data.append(self.get_frame())
-        data.append(self.geo.getNumVertexes())
-        return data
-
-    def getPreCode(self):
-        dt = self.get_property('Depend Time')
-        names = list(self.geo.attributeMap["vertex"].keys())
-        if dt:
-            names.append('Frame')
-        lts = ','.join(names)
-        # pss = ""
-        # for n in names:
-        #     pss += "'{0}':{0},".format(n)
-        # pss = '{' + pss + '}'
-        return self.preCode.format(lts)
-
-    def updateCode(self):
-        if self.geo is None:
-            return
-        preCode = self.getPreCode()
-        lines = self.get_property('Script').strip()
-        lines = preCode + '\n'.join('        ' + line for line in lines.splitlines())
-        if self.namespace['gp'] is None:
-            self.namespace['gp'] = self.graph
-        exec(lines, self.namespace)
-        self.func = numba.jit(nopython=True, nogil=True, parallel=True)(self.namespace['run_per_vertex'])
 
-    def set_property(self, name, value):
-        super().set_property(name, value)
-        if name == 'Script' or name == 'Depend Time':
-            self.updateCode()
-            self.cook()
+class FaceWrangle(WrangleNode):
+    """
+    Run the script for every face in parallel.
+    Face attributes are bound by their names, vertex attributes by v_ and their names, the face index is idx,
+    the vertices of the face are face_vertices[face_offsets[idx]:face_offsets[idx + 1]].
+    Faces are run serially if the script writes vertex attributes, as faces share their vertices.
+    """
 
-    def execute(self):
-        data = self.getAllVertexAttributes()
-        if self.func is None:
-            self.updateCode()
-        try:
-            self.func(*data)
-        except:
-            self.error(traceback.format_exc())
+    __identifier__ = 'Script'
+    NODE_NAME = 'Face_Wrangle'
+    ATTRIB_CLASS = 'face'
+    BIND = {'face': '', 'vertex': 'v_'}
+    TOPOLOGY = ('face_offsets', 'face_vertices')
 
-    def run(self):
-        if not self.copyData():
-            self.geo = None
-            return
 
-        self.execute()
\ No newline at end of file
+class EdgeWrangle(WrangleNode):
+    """
+    Run the script for every edge in parallel.
+    Edge attributes are bound by their names, vertex attributes by v_ and their names, the edge index is idx,
+    the vertices of the edge are edge_vertices[idx, 0] and edge_vertices[idx, 1].
+    Edges are run serially if the script writes vertex attributes, as edges share their vertices.
+    """
+
+    __identifier__ = 'Script'
+    NODE_NAME = 'Edge_Wrangle'
+    ATTRIB_CLASS = 'edge'
+    BIND = {'edge': '', 'vertex': 'v_'}
+    TOPOLOGY = ('edge_vertices',)
+
+
+class DetailWrangle(WrangleNode):
+    """
+    Run the script once.
+    Numeric detail attributes are bound by their names as 1d arrays,
+    vertex, face and edge attributes by v_, f_ and e_ and their names.
+    """
+
+    __identifier__ = 'Script'
+    NODE_NAME = 'Detail_Wrangle'
+    ATTRIB_CLASS = 'detail'
+    BIND = {'detail': '', 'vertex': 'v_', 'face': 'f_', 'edge': 'e_'}
+    TOPOLOGY = ('face_offsets', 'face_vertices', 'edge_vertices')
@@ -2,6 +2,8 @@ import numpy as np
 from OpenGL.arrays import vbo
 from .Mesh_utils import MeshFuncs, MeshSignals, BBox
 import openmesh
+import threading
+import weakref
 import copy
 from .Shader import *
 
@@ -147,6 +149,25 @@ def get_shape(element_num, base_shape):
     return shape
 
 
+class _MeshShare(object):
+    """
+    Reference count of the openmesh data shared by meshes, see Mesh.shallowCopy.
+    Each mesh releases its reference when it stops sharing the data or when it is garbage collected.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            self.count += 1
+
+    def release(self):
+        with self.lock:
+            self.count -= 1
+
+
 class Mesh(object):
     def __init__(self, mesh=None):
 
@@ -170,6 +191,13 @@ class Mesh(object):
 
         self.signals = MeshSignals()
         self._selected = False
+        # reference count shared by all meshes using the same openmesh data, None means exclusive.
+        self._share = None
+        # weakref.finalize releasing the reference when the mesh is garbage collected.
+        self._shareRelease = None
+        # {(attribClass, name): data} attributes written while the openmesh data is shared,
+        # None means the attribute is removed, they are written into openmesh by Mesh._detach.
+        self._attribData = {}
 
         self.edge_colors = {
             True: (1.0, 1.0, 0.0, 1.0),
@@ -206,6 +234,7 @@ class Mesh(object):
         Returns:
             MeshFuncs object.
         """
+        self._detach()
         return MeshFuncs(self)
 
     @property
@@ -216,8 +245,163 @@ class Mesh(object):
         Returns:
             openmesh.PolyMesh.
         """
+        self._detach()
         return self._mesh
 
+    def shallowCopy(self):
+        """
+        Copy the mesh without copying the openmesh data.
+        The data is shared until one of the meshes modifies it.
+
+        Returns:
+            Mesh.
+        """
+        mesh = Mesh()
+        if self._share is None:
+            self._joinShare(_MeshShare())
+        mesh._joinShare(self._share)
+        mesh._mesh = self._mesh
+        mesh.opts = self.opts.copy()
+        mesh._attributeMap = copy.deepcopy(self._attributeMap)
+        for key, data in self._attribData.items():
+            if isinstance(data, np.ndarray):
+                # both meshes keep the array, a write of either mesh replaces it.
+                data.flags.writeable = False
+            elif data is not None:
+                data = list(data)
+            mesh._attribData[key] = data
+        return mesh
+
+    def isShared(self):
+        """
+        Returns whether the openmesh data is shared with other meshes.
+        """
+        return self._share is not None and self._share.count > 1
+
+    def _joinShare(self, share):
+        share.acquire()
+        self._share = share
+        # the finalizer must not reference the mesh, or the mesh would never be collected.
+        self._shareRelease = weakref.finalize(self, share.release)
+
+    def _leaveShare(self):
+        # calling the finalizer releases the reference once, it does nothing when the mesh is collected later.
+        self._shareRelease()
+        self._shareRelease = None
+        self._share = None
+
+    def _detach(self):
+        """
+        Copy the shared openmesh data before modifying its topology,
+        the attributes written since the data is shared are written into the copy.
+        """
+        if self._share is not None:
+            # the reference is kept while copying, so the other meshes don't modify the data in the meantime.
+            if self._share.count > 1:
+                self._mesh = copy.deepcopy(self._mesh)
+            self._leaveShare()
+        attribData, self._attribData = self._attribData, {}
+        for (attribClass, name), data in attribData.items():
+            if data is None:
+                if getattr(self._mesh, 'has_{}_property'.format(attribClass))(name):
+                    getattr(self._mesh, 'remove_{}_property'.format(attribClass))(name)
+            elif name == 'pos':
+                self._mesh.points()[..., [0, 1, 2]] = data
+            elif name == 'normal':
+                normals = self._mesh.vertex_normals() if attribClass == 'vertex' else self._mesh.face_normals()
+                normals[..., [0, 1, 2]] = data
+            else:
+                self._writeAttribData(attribClass, name, data)
+
+    def _readonly(self, data):
+        """
+        Protect the array view of the shared openmesh data from in-place modification.
+        """
+        if self.isShared():
+            data.flags.writeable = False
+        return data
+
+    def _writeAttribData(self, attribClass, name, data):
+        # write a custom attribute into openmesh, the property is created if needed.
+        if getattr(self._mesh, 'has_{}_property'.format(attribClass))(name):
+            pass
+        elif self.getAttribIsArray(attribClass, name):
+            getattr(self._mesh, '{}_property_array'.format(attribClass))(name)
+        else:
+            getattr(self._mesh, '{}_property'.format(attribClass))(name)
+        if self.getAttribIsArray(attribClass, name):
+            getattr(self._mesh, 'set_{}_property_array'.format(attribClass))(name, data)
+        else:
+            getattr(self._mesh, 'set_{}_property'.format(attribClass))(name, list(data))
+
+    def _getAttribData(self, attribClass, name):
+        """
+        Get the data of an attribute, the attributes written while the mesh is shared come first.
+        """
+        key = (attribClass, name)
+        if key in self._attribData:
+            return self._attribData[key]
+        if name == 'pos':
+            return self._readonly(self._mesh.points())
+        if self.getAttribIsArray(attribClass, name):
+            return getattr(self._mesh, '{}_property_array'.format(attribClass))(name)
+        return getattr(self._mesh, '{}_property'.format(attribClass))(name)
+
+    def _setAttribData(self, attribClass, name, data):
+        """
+        Set the data of a custom attribute.
+        Only the written attribute is copied when the openmesh data is shared.
+        """
+        if self.isShared():
+            if self.getAttribIsArray(attribClass, name):
+                self._attribData[(attribClass, name)] = np.array(data)
+            else:
+                self._attribData[(attribClass, name)] = list(data)
+            return
+        self._detach()
+        self._writeAttribData(attribClass, name, data)
+
+    def _getAttrib(self, attribClass, name, index):
+        # get the attribute value of one element.
+        key = (attribClass, name)
+        if key in self._attribData:
+            return self._attribData[key][index]
+        handle = getattr(self._mesh, '{}_handle'.format(attribClass))(index)
+        if name == 'pos':
+            return self._mesh.point(handle)
+        return getattr(self._mesh, '{}_property'.format(attribClass))(name, handle)
+
+    def _setAttrib(self, attribClass, name, index, value):
+        # set the attribute value of one element, only the written attribute is copied when the mesh is shared.
+        if self.isShared():
+            key = (attribClass, name)
+            data = self._attribData.get(key, None)
+            if key not in self._attribData:
+                data = self._getAttribData(attribClass, name)
+                data = np.array(data) if isinstance(data, np.ndarray) else list(data)
+            elif isinstance(data, np.ndarray) and not data.flags.writeable:
+                data = np.array(data)
+            data[index] = value
+            self._attribData[key] = data
+            return
+        self._detach()
+        handle = getattr(self._mesh, '{}_handle'.format(attribClass))(index)
+        if name == 'pos':
+            self._mesh.set_point(handle, value)
+        else:
+            getattr(self._mesh, 'set_{}_property'.format(attribClass))(name, handle, value)
+
+    def _setViewData(self, attribClass, name, getView, data):
+        # write the positions or normals, only they are copied when the mesh is shared.
+        view = getView()
+        if self.isShared():
+            view = np.array(view)
+            view[..., [0, 1, 2]] = data
+            self._attribData[(attribClass, name)] = view
+        else:
+            self._detach()
+            getView()[..., [0, 1, 2]] = data
+
     @property
     def bbox_min(self):
         """
@@ -402,7 +586,7 @@ class Mesh(object):
                     glDisableClientState(GL_TEXTURE_COORD_ARRAY)
 
         if self.view().opts['drawPoints']:
-            if self._mesh.has_vertex_property("pscale"):
+            if self.hasAttribute('vertex', 'pscale'):
                 pscale = self.getVertexAttribData("pscale")
             else:
                 pscale = None
@@ -457,7 +641,7 @@ class Mesh(object):
         Returns:
             np.ndarray, shape = (nv,3).
         """
-        p = self._mesh.points()
+        p = self.getVertexAttribData('pos')
         if p.shape[0] == 0:
             return None
         return p
@@ -508,9 +692,14 @@ class Mesh(object):
         if not self.hasAttribute('vertex', 'normal'):
             if self.getNumFaces() == 0:
                 return None
+            # the normals are computed into the openmesh data.
+            self._detach()
             self.createAttribute('vertex', 'normal', attribType='vector3', defaultValue=[0, 0, 0], applyValue=False)
             self._mesh.update_vertex_normals()
-        return self._mesh.vertex_normals()
+        normals = self._attribData.get(('vertex', 'normal'), None)
+        if normals is not None:
+            return normals
+        return self._readonly(self._mesh.vertex_normals())
 
     def getFaceNormals(self):
         """
@@ -522,9 +711,13 @@ class Mesh(object):
         if not self.hasAttribute('face', 'normal'):
             if self.getNumFaces() == 0:
                 return None
+            self._detach()
             self.createAttribute('face', 'normal', attribType='vector3', defaultValue=[0, 0, 0], applyValue=False)
             self._mesh.update_face_normals()
-        return self._mesh.face_normals()
+        normals = self._attribData.get(('face', 'normal'), None)
+        if normals is not None:
+            return normals
+        return self._readonly(self._mesh.face_normals())
 
     def getVertexFaces(self):
         """
@@ -548,6 +741,20 @@ class Mesh(object):
             return None
         return e
 
+    def getFaceVertexCSR(self):
+        """
+        Get mesh face-vertex indices in compressed rows,
+        the vertices of face i are indices[offsets[i]:offsets[i + 1]].
+
+        Returns:
+            tuple(np.ndarray, np.ndarray): offsets, shape = (nf+1,) and indices.
+        """
+        f = self._mesh.face_vertex_indices()
+        mask = f >= 0
+        offsets = np.zeros(f.shape[0] + 1, dtype=np.int64)
+        np.cumsum(mask.sum(axis=1), out=offsets[1:])
+        return offsets, f[mask].astype(np.int64)
+
     def getNumVertexes(self):
         """
         Get mesh vertices count.
@@ -575,6 +782,90 @@ class Mesh(object):
         """
         return self._mesh.n_edges()
 
+    def getMemorySize(self):
+        """
+        Get a rough memory size of the mesh data.
+        The openmesh data shared by shallow copies is split among them,
+        so the sizes of all meshes add up to the memory actually used.
+
+        Returns:
+            int: bytes.
+        """
+        counts = {'vertex': self.getNumVertexes(), 'face': self.getNumFaces(), 'edge': self.getNumEdges()}
+        # positions and half edge connectivity of openmesh.
+        size = counts['vertex'] * 40 + counts['face'] * 16 + counts['edge'] * 40
+        for attribClass, count in counts.items():
+            for name, info in self._attributeMap[attribClass].items():
+                if name == 'pos':
+                    continue
+                try:
+                    size += count * max(np.size(info['default_value']), 1) * 8
+                except ValueError:
+                    size += count * 8
+        share = self._share
+        if share is not None and share.count > 1:
+            size //= share.count
+        # the attributes written while the data is shared are kept by the mesh.
+        size += sum(data.nbytes for data in self._attribData.values() if isinstance(data, np.ndarray))
+        return size
+
+    def toArrays(self):
+        """
+        Get the mesh topology and attributes as numpy arrays, used to save the mesh to the disk.
+
+        Returns:
+            (dict, dict): {name: np.ndarray} and the attribute map, None if any attribute is not an array.
+        """
+        arrays = {'points': np.array(self.getVertexAttribData('pos')),
+                  'faces': self._mesh.face_vertex_indices()}
+        getters = {'vertex': self.getVertexAttribData, 'face': self.getFaceAttribData, 'edge': self.getEdgeAttribData}
+        for attribClass, getter in getters.items():
+            for name in self._attributeMap[attribClass].keys():
+                if name == 'pos':
+                    continue
+                data = getter(name)
+                if not isinstance(data, np.ndarray) or data.dtype == object:
+                    return None
+                arrays['{}:{}'.format(attribClass, name)] = data
+        return arrays, self._attributeMap
+
+    @staticmethod
+    def fromArrays(arrays, attributeMap):
+        """
+        Create a mesh by the data returned by Mesh.toArrays.
+
+        Args:
+            arrays(dict): {name: np.ndarray}.
+            attributeMap(dict): mesh attribute map.
+
+        Returns:
+            Mesh.
+        """
+        mesh = Mesh()
+        points = arrays['points']
+        faces = arrays['faces']
+        if points.shape[0] > 0:
+            mesh.addVertices(points)
+        if faces.shape[0] > 0:
+            if np.all(faces >= 0):
+                mesh.addFaces(faces)
+            else:
+                for face in faces:
+                    mesh._mesh.add_face([mesh._mesh.vertex_handle(i) for i in face[face >= 0]])
+
+        setters = {'vertex': mesh.setVertexAttribData, 'face': mesh.setFaceAttribData, 'edge': mesh.setEdgeAttribData}
+        counts = {'vertex': mesh.getNumVertexes(), 'face': mesh.getNumFaces(), 'edge': mesh.getNumEdges()}
+        for attribClass, setter in setters.items():
+            for name, info in attributeMap[attribClass].items():
+                if name == 'pos':
+                    continue
+                data = arrays['{}:{}'.format(attribClass, name)]
+                if data.shape[0] != counts[attribClass]:
+                    raise ValueError('{} attribute {} does not match the mesh'.format(attribClass, name))
+                setter(name, data, info['type'], info['default_value'])
+        mesh._attributeMap = attributeMap
+        return mesh
+
     @property
     def attributeMap(self):
         """
@@ -731,6 +1022,8 @@ class Mesh(object):
             defaultValue(any): default value of the attribute.
             applyValue(bool): apply the default value.
         """
+        if attribClass != 'detail' and not self.isShared():
+            self._detach()
         if attribType is None:
             attribType = self._getAttribType(attribClass, name)
         if defaultValue is None:
@@ -741,41 +1034,25 @@ class Mesh(object):
         if attribType == 'list':
             shape = [0, len(defaultValue)]
 
-        if attribClass == "vertex":
-            if name == 'pos':
+        if attribClass in ("vertex", "face", "edge"):
+            if attribClass == "vertex" and name == 'pos':
                 return
-            if array_mode:
-                self._mesh.vertex_property_array(name)
-            else:
-                self._mesh.vertex_property(name)
-            if applyValue:
-                data = np.broadcast_to(defaultValue, get_shape(self.getNumVertexes(), shape))
-                if array_mode:
-                    self._mesh.set_vertex_property_array(name, data)
-                else:
-                    self._mesh.set_vertex_property(name, list(data))
-        elif attribClass == "face":
-            if array_mode:
-                self._mesh.face_property_array(name)
-            else:
-                self._mesh.face_property(name)
-            if applyValue:
-                data = np.broadcast_to(defaultValue, get_shape(self.getNumFaces(), shape))
-                if array_mode:
-                    self._mesh.set_face_property_array(name, data)
-                else:
-                    self._mesh.set_face_property(name, list(data))
-        elif attribClass == "edge":
-            if array_mode:
-                self._mesh.edge_property_array(name)
+            count = {'vertex': self.getNumVertexes, 'face': self.getNumFaces, 'edge': self.getNumEdges}[attribClass]()
+            if self.isShared():
+                # the attribute is kept by the mesh, the shared openmesh data is not changed.
+                data = np.broadcast_to(defaultValue, get_shape(count, shape))
+                self._attribData[(attribClass, name)] = np.array(data) if array_mode else list(data)
             else:
-                self._mesh.edge_property(name)
-            if applyValue:
-                data = np.broadcast_to(defaultValue, get_shape(self.getNumEdges(), shape))
                 if array_mode:
-                    self._mesh.set_edge_property_array(name, data)
+                    getattr(self._mesh, '{}_property_array'.format(attribClass))(name)
                 else:
-                    self._mesh.set_edge_property(name, list(data))
+                    getattr(self._mesh, '{}_property'.format(attribClass))(name)
+                if applyValue:
+                    data = np.broadcast_to(defaultValue, get_shape(count, shape))
+                    if array_mode:
+                        getattr(self._mesh, 'set_{}_property_array'.format(attribClass))(name, data)
+                    else:
+                        getattr(self._mesh, 'set_{}_property'.format(attribClass))(name, list(data))
         elif attribClass == "detail":
             array_mode = False
         else:
@@ -792,20 +1069,17 @@ class Mesh(object):
             attribClass(str): one of ['vertex', 'edge', 'face', 'detail'].
             name(str): specific attribute name.
         """
-        if attribClass == "vertex":
-            if name == 'pos':
+        if attribClass != 'detail' and not self.isShared():
+            self._detach()
+        if attribClass in ("vertex", "face", "edge"):
+            if attribClass == "vertex" and name == 'pos':
                 return
-            if self._mesh.has_vertex_property(name):
-                self._mesh.remove_vertex_property(name)
-                self._attributeMap["vertex"].pop(name)
-        elif attribClass == "face":
-            if self._mesh.has_face_property(name):
-                self._mesh.remove_face_property(name)
-                self._attributeMap["face"].pop(name)
-        elif attribClass == "edge":
-            if self._mesh.has_edge_property(name):
-                self._mesh.remove_edge_property(name)
-                self._attributeMap["edge"].pop(name)
+            if self.hasAttribute(attribClass, name):
+                if self.isShared():
+                    self._attribData[(attribClass, name)] = None
+                elif getattr(self._mesh, 'has_{}_property'.format(attribClass))(name):
+                    getattr(self._mesh, 'remove_{}_property'.format(attribClass))(name)
+                self._attributeMap[attribClass].pop(name)
         elif attribClass == "detail":
             if name in self._attributeMap["detail"].keys():
                 self._attributeMap["detail"].pop(name)
@@ -878,6 +1152,7 @@ class Mesh(object):
         Returns:
             openmesh.VertexHandle.
         """
+        self._detach()
         if type(pos) is list:
             return self._mesh.add_vertex(np.array(pos))
         elif type(pos) is np.ndarray:
@@ -894,6 +1169,7 @@ class Mesh(object):
         Returns:
             openmesh.FaceHandle
         """
+        self._detach()
         self._GLFaces = None
         if type(vts[0]) is openmesh.VertexHandle:
             return self._mesh.add_face(vts)
@@ -907,6 +1183,7 @@ class Mesh(object):
         Args:
             vts: new vertices , np.ndarray or list, shape = (n,3).
         """
+        self._detach()
         self._GLFaces = None
         self._mesh.add_vertices(vts)
 
@@ -917,6 +1194,7 @@ class Mesh(object):
         Args:
             fcs: new faces , np.ndarray or list of ndarray.
         """
+        self._detach()
         self._GLFaces = None
         self._mesh.add_faces(fcs)
 
@@ -929,6 +1207,7 @@ class Mesh(object):
             isolate(bool): if True, delete the connected elements.
             clean(bool): if True, garbage collection after delete.
         """
+        self._detach()
         if type(vt) is not openmesh.VertexHandle:
             vt = self._mesh.vertex_handle(vt)
         if vt.idx() < self.getNumVertexes():
@@ -946,6 +1225,7 @@ class Mesh(object):
             isolate(bool): if True, delete the connected elements.
             clean(bool): if True, garbage collection after delete.
         """
+        self._detach()
         if type(fc) is not openmesh.FaceHandle:
             fc = self._mesh.face_handle(fc)
         if fc.idx() < self.getNumFaces():
@@ -963,6 +1243,7 @@ class Mesh(object):
             isolate(bool): if True, delete the connected elements.
             clean(bool): if True, garbage collection after delete.
         """
+        self._detach()
         if type(eg) is not openmesh.EdgeHandle:
             eg = self._mesh.edge_handle(eg)
         if eg.idx() < self.getNumEdges():
@@ -978,6 +1259,7 @@ class Mesh(object):
         @param vts: list of vertex index or list of vertex handle.
         @param isolate: if True, delete the connected elements.
         """
+        self._detach()
         for vt in vts:
             self.removeVertex(vt, isolate, False)
         self._mesh.garbage_collection()
@@ -990,6 +1272,7 @@ class Mesh(object):
             fcs(list): list of face index or list of face handle.
             isolate(bool): if True, delete the connected elements.
         """
+        self._detach()
         for fc in fcs:
             self.removeFace(fc, isolate, False)
         self._mesh.garbage_collection()
@@ -1002,6 +1285,7 @@ class Mesh(object):
             egs(list): list of edge index or list of edge handle.
             isolate(bool): if True, delete the connected elements.
         """
+        self._detach()
         for eg in egs:
             self.removeEdge(eg, isolate, False)
         self._mesh.garbage_collection()
@@ -1010,7 +1294,12 @@ class Mesh(object):
         """
         Clear all mesh data.
         """
-        self._mesh.clear()
+        if self._share is not None:
+            self._leaveShare()
+            self._mesh = openmesh.PolyMesh()
+        else:
+            self._mesh.clear()
+        self._attribData = {}
         self._attributeMap = {}
         self.signals.emit_attribChanged()
         self.update()
@@ -1025,16 +1314,14 @@ class Mesh(object):
             vertex attribute data.
         """
         if name == 'pos':
-            return self._mesh.points()
+            # a read-only view while the mesh is shared, use setVertexAttribData to modify it.
+            return self._getAttribData('vertex', 'pos')
         elif name == 'normal':
             return self.getNormals()
         else:
             if not self.hasAttribute('vertex', name):
                 raise AttributeError("Attribute {} does't exist!".format(name))
-            if self.getAttribIsArray('vertex', name):
-                return self._mesh.vertex_property_array(name)
-            else:
-                return self._mesh.vertex_property(name)
+            return self._getAttribData('vertex', name)
 
     def getFaceAttribData(self, name):
         """
@@ -1048,12 +1335,9 @@ class Mesh(object):
         if name == 'normal':
             return self.getFaceNormals()
         else:
-            if not self._mesh.has_face_property(name):
+            if not self.hasAttribute('face', name):
                 raise AttributeError("Attribute {} does't exist!".format(name))
-            if self.getAttribIsArray('face', name):
-                return self._mesh.face_property_array(name)
-            else:
-                return self._mesh.face_property(name)
+            return self._getAttribData('face', name)
 
     def getEdgeAttribData(self, name):
         """
@@ -1064,12 +1348,9 @@ class Mesh(object):
         Returns:
             edge attribute data.
         """
-        if not self._mesh.has_edge_property(name):
+        if not self.hasAttribute('edge', name):
             raise AttributeError("Attribute {} does't exist!".format(name))
-        if self.getAttribIsArray('edge', name):
-            return self._mesh.edge_property_array(name)
-        else:
-            return self._mesh.edge_property(name)
+        return self._getAttribData('edge', name)
 
     def setVertexAttribData(self, name, data, attribType=None, defaultValue=None):
         """
@@ -1082,20 +1363,15 @@ class Mesh(object):
             defaultValue(any): if the attribute is not exist, we need defaultValue to create the attribute.
         """
         if name == 'pos':
-            self._mesh.points()[..., [0, 1, 2]] = data
+            self._setViewData('vertex', 'pos', lambda: self._getAttribData('vertex', 'pos'), data)
         elif name == 'normal':
-            self.getNormals()[..., [0, 1, 2]] = data
+            self._setViewData('vertex', 'normal', self.getNormals, data)
         else:
-            if not self._mesh.has_vertex_property(name):
+            if not self.hasAttribute('vertex', name):
                 if defaultValue is None:
                     defaultValue = data[0]
                 self.createAttribute('vertex', name, attribType, defaultValue=defaultValue, applyValue=False)
-            is_array = self.getAttribIsArray('vertex', name)
-
-            if is_array:
-                self._mesh.set_vertex_property_array(name, data)
-            else:
-                self._mesh.set_vertex_property(name, data)
+            self._setAttribData('vertex', name, data)
         self.signals.emit_attribChanged()
 
     def setFaceAttribData(self, name, data, attribType=None, defaultValue=None):
@@ -1109,18 +1385,13 @@ class Mesh(object):
             defaultValue(any): if the attribute is not exist, we need defaultValue to create the attribute.
         """
         if name == 'normal':
-            self.getFaceNormals()[..., [0, 1, 2]] = data
+            self._setViewData('face', 'normal', self.getFaceNormals, data)
         else:
-            if not self._mesh.has_face_property(name):
+            if not self.hasAttribute('face', name):
                 if defaultValue is None:
                     defaultValue = data[0]
                 self.createAttribute('face', name, attribType, defaultValue=defaultValue, applyValue=False)
-            is_array = self.getAttribIsArray('face', name)
-
-            if is_array:
-                self._mesh.set_face_property_array(name, data)
-            else:
-                self._mesh.set_face_property(name, data)
+            self._setAttribData('face', name, data)
         self.signals.emit_attribChanged()
 
     def setEdgeAttribData(self, name, data, attribType=None, defaultValue=None):
@@ -1133,16 +1404,11 @@ class Mesh(object):
             attribType(str): if the attribute is not exist, we need attribType to create the attribute.
             defaultValue(any): if the attribute is not exist, we need defaultValue to create the attribute.
         """
-        if not self._mesh.has_edge_property(name):
+        if not self.hasAttribute('edge', name):
             if defaultValue is None:
                 defaultValue = data[0]
             self.createAttribute('edge', name, attribType, defaultValue=defaultValue, applyValue=False)
-        is_array = self.getAttribIsArray('edge', name)
-
-        if is_array:
-            self._mesh.set_edge_property_array(name, data)
-        else:
-            self._mesh.set_edge_property(name, data)
+        self._setAttribData('edge', name, data)
 
         self.signals.emit_attribChanged()
 
@@ -1156,13 +1422,10 @@ class Mesh(object):
         Returns:
             vertex attribute value.
         """
-        vh = self._mesh.vertex_handle(index)
-        if self._mesh.has_vertex_property(name):
-            return self._mesh.vertex_property(name, vh)
-        if name == 'pos':
-            return self._mesh.point(vh)
-        elif name == 'normal':
-            return self._mesh.normal(vh)
+        if self.hasAttribute('vertex', name):
+            return self._getAttrib('vertex', name, index)
+        if name == 'normal':
+            return self._mesh.normal(self._mesh.vertex_handle(index))
 
     def getFaceAttrib(self, name, index):
         """
@@ -1174,11 +1437,10 @@ class Mesh(object):
         Returns:
             face attribute value.
         """
-        fh = self._mesh.face_handle(index)
-        if self._mesh.has_face_property(name):
-            return self._mesh.face_property(name, fh)
+        if self.hasAttribute('face', name):
+            return self._getAttrib('face', name, index)
         if name == 'normal':
-            return self._mesh.normal(fh)
+            return self._mesh.normal(self._mesh.face_handle(index))
 
     def getEdgeAttrib(self, name, index):
         """
@@ -1190,9 +1452,8 @@ class Mesh(object):
         Returns:
             edge attribute value.
         """
-        eh = self._mesh.edge_handle(index)
-        if self._mesh.has_edge_property(name):
-            return self._mesh.edge_property(name, eh)
+        if self.hasAttribute('edge', name):
+            return self._getAttrib('edge', name, index)
         return None
 
     def setVertexAttrib(self, name, index, value):
@@ -1204,16 +1465,16 @@ class Mesh(object):
             index(int): vertex index.
             value(any): attribute value.
         """
-        vh = self._mesh.vertex_handle(index)
-        if self._mesh.has_vertex_property(name):
-            self._mesh.set_vertex_property(name, vh, value)
-            self.signals.emit_attribChanged()
-            return True
         if name == 'pos':
-            self._mesh.set_point(vh, value)
+            self._setAttrib('vertex', name, index, value)
             return True
-        elif name == 'normal':
-            self._mesh.set_normal(vh, value)
+        if self.hasAttribute('vertex', name):
+            self._setAttrib('vertex', name, index, value)
+            self.signals.emit_attribChanged()
+            return True
+        if name == 'normal':
+            self._detach()
+            self._mesh.set_normal(self._mesh.vertex_handle(index), value)
             return True
         return False
 
@@ -1226,13 +1487,13 @@ class Mesh(object):
             index(int): face index.
             value(any): attribute value.
         """
-        fh = self._mesh.face_handle(index)
-        if self._mesh.has_face_property(name):
-            self._mesh.set_face_property(name, fh, value)
+        if self.hasAttribute('face', name):
+            self._setAttrib('face', name, index, value)
             self.signals.emit_attribChanged()
             return True
         if name == 'normal':
-            self._mesh.set_normal(fh, value)
+            self._detach()
+            self._mesh.set_normal(self._mesh.face_handle(index), value)
             return True
         return False
 
@@ -1245,9 +1506,8 @@ class Mesh(object):
             index(int): edge index.
             value(any): attribute value.
         """
-        eh = self._mesh.edge_handle(index)
-        if self._mesh.has_edge_property(name):
-            self._mesh.set_edge_property(name, eh, value)
+        if self.hasAttribute('edge', name):
+            self._setAttrib('edge', name, index, value)
             self.signals.emit_attribChanged()
             return True
         return False
@@ -1322,18 +1582,10 @@ class Mesh(object):
         Returns:
              list of bool.
         """
-        if groupClass == 'vertex':
-            name = "v:" + name
-            if self._mesh.has_vertex_property(name):
-                return self._mesh.vertex_property_array(name).astype(np.bool)
-        elif groupClass == 'face':
-            name = "f:" + name
-            if self._mesh.has_face_property(name):
-                return self._mesh.face_property_array(name).astype(np.bool)
-        elif groupClass == 'edge':
-            name = "e:" + name
-            if self._mesh.has_edge_property(name):
-                return self._mesh.edge_property_array(name).astype(np.bool)
+        if groupClass in ('vertex', 'face', 'edge'):
+            name = groupClass[0] + ":" + name
+            if self.hasAttribute(groupClass, name):
+                return np.asarray(self._getAttribData(groupClass, name)).astype(np.bool)
         else:
             raise AttributeError("class {} does not support group".format(groupClass))
 
@@ -1369,21 +1621,10 @@ class Mesh(object):
         Returns:
             group value(bool).
         """
-        if groupClass == 'vertex':
-            name = "v:" + name
-            if self._mesh.has_vertex_property(name):
-                vh = self._mesh.vertex_handle(index)
-                return bool(self._mesh.vertex_property(name, vh))
-        elif groupClass == 'face':
-            name = "f:" + name
-            if self._mesh.has_face_property(name):
-                fh = self._mesh.face_handle(index)
-                return bool(self._mesh.face_property(name, fh))
-        elif groupClass == 'edge':
-            name = "e:" + name
-            if self._mesh.has_edge_property(name):
-                eh = self._mesh.edge_handle(index)
-                return bool(self._mesh.edge_property(name, eh))
+        if groupClass in ('vertex', 'face', 'edge'):
+            name = groupClass[0] + ":" + name
+            if self.hasAttribute(groupClass, name):
+                return bool(self._getAttrib(groupClass, name, index))
 
     def setGroup(self, groupClass, name, index, value):
         """
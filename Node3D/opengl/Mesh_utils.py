@@ -23,6 +23,17 @@ def _calVertexSmooth(data, iter, vv):
                 data[v] = pos / num
 
 
+def warm_up():
+    """
+    Compile the smooth kernel for the positions and the float vector attributes.
+    """
+
+    # openmesh returns the vertex vertex indices as int32, -1 pads the rows.
+    vv = np.array([[1, -1], [0, -1]], dtype=np.int32)
+    for dtype in (np.float32, np.float64):
+        _calVertexSmooth(np.ones((2, 3), dtype=dtype), 1, vv)
+
+
 class MeshFuncs(object):
     def __init__(self, geo):
         self.geo = geo
@@ -0,0 +1,165 @@
+from .nodes.subgraph_nodes import PublishedGeometry
+from .constants import NODE_MANIFEST_PATH
+import inspect
+import importlib
+import json
+import sys
+import os
+
+NODE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nodes")
+IMAGE_NODE_PATH = os.path.join(NODE_PATH, "image_nodes")
+PUBLISHED_NODE_PATH = os.path.join(NODE_PATH, "published_nodes")
+
+
+# increase it when the manifest format changes, old manifests are generated again.
+MANIFEST_VERSION = 1
+
+
+class LazyNodeClass(object):
+    """
+    Node class read from the node manifest.
+    It has the class attributes used to register the node,
+    the node module is imported when the node is first created or any other attribute is used.
+    """
+
+    def __init__(self, entry):
+        self.type_ = entry['type']
+        self.NODE_NAME = entry['name']
+        self.__identifier__ = entry['identifier']
+        self.NODE_CATEGORY = entry['category']
+        self.module_name = entry['module']
+        self.class_name = entry['class']
+        self._node_class = None
+
+    def load(self):
+        """
+        Import the node module.
+
+        Returns:
+            type: node class.
+        """
+
+        if self._node_class is None:
+            module = importlib.import_module(self.module_name)
+            self._node_class = getattr(module, self.class_name)
+        return self._node_class
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __repr__(self):
+        return '<{} {}>'.format(self.__class__.__name__, self.type_)
+
+
+def _add_sys_path(folder_path):
+    path, folder_name = os.path.split(folder_path)
+    if path not in sys.path:
+        sys.path.append(path)
+    return folder_name
+
+
+def _module_files(folder_path):
+    files = {}
+    for i in sorted(os.listdir(folder_path)):
+        if not i.endswith(".py") or i.startswith("_"):
+            continue
+        stat = os.stat(os.path.join(folder_path, i))
+        files[i] = [stat.st_mtime, stat.st_size]
+    return files
+
+
+def get_nodes_from_folder(folder_path):
+    if not os.path.exists(folder_path):
+        return []
+    folder_name = _add_sys_path(folder_path)
+
+    nodes = []
+    for i in os.listdir(folder_path):
+        if not i.endswith(".py") or i.startswith("_"):
+            continue
+
+        filename = i[:-3]
+        module_name = folder_name + "." + filename
+
+        for name, obj in inspect.getmembers(importlib.import_module(module_name)):
+            if inspect.isclass(obj) and filename in str(obj):
+                if len(inspect.getmembers(obj)) > 0 and obj.__identifier__ != '__None':
+                    nodes.append(obj)
+    return nodes
+
+
+def _manifest_entry(node):
+    return {'type': node.type_, 'name': node.NODE_NAME, 'identifier': node.__identifier__,
+            'category': node.NODE_CATEGORY, 'module': node.__module__, 'class': node.__name__}
+
+
+def get_lazy_nodes_from_folders(folder_paths, manifest_path=NODE_MANIFEST_PATH):
+    """
+    Returns the node classes of the folders from the node manifest without importing the node modules.
+    The manifest is generated again by importing the modules if any module file is changed.
+
+    Args:
+        folder_paths(list[str]): node module folders.
+        manifest_path(str): node manifest file path.
+
+    Returns:
+        list[LazyNodeClass or type]: node classes, imported classes if the manifest can not be used.
+    """
+
+    folder_paths = [p for p in folder_paths if os.path.exists(p)]
+    files = {p: _module_files(p) for p in folder_paths}
+    [_add_sys_path(p) for p in folder_paths]
+
+    try:
+        with open(manifest_path) as data_file:
+            manifest = json.load(data_file)
+        if manifest.get('version') == MANIFEST_VERSION and manifest.get('files') == files:
+            return [LazyNodeClass(entry) for entry in manifest['nodes']]
+    except (IOError, OSError, ValueError, KeyError):
+        pass
+
+    nodes = []
+    [nodes.extend(get_nodes_from_folder(p)) for p in folder_paths]
+    manifest = {'version': MANIFEST_VERSION, 'files': files, 'nodes': [_manifest_entry(n) for n in nodes]}
+    try:
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(manifest_path, 'w') as file_out:
+            json.dump(manifest, file_out, indent=2)
+    except (IOError, OSError, TypeError):
+        pass
+    return nodes
+
+
+def get_published_nodes_from_folder(folder_path):
+    if not os.path.exists(folder_path):
+        return []
+    path, folder_name = os.path.split(folder_path)
+    if path not in sys.path:
+        sys.path.append(path)
+
+    nodes = []
+    for i in os.listdir(folder_path):
+        if not i.endswith(".node") and not i.endswith(".json"):
+            continue
+        file_name = os.path.join(folder_path, i)
+        node = PublishedGeometry.create_node_class(file_name, PublishedGeometry)
+        if node is not None:
+            nodes.append(node)
+
+    return nodes
+
+
+def get_default_nodes():
+    """
+    Returns all node classes shipped with Node3D.
+    Node modules are imported when the nodes are first created, see get_lazy_nodes_from_folders.
+    """
+
+    nodes = get_lazy_nodes_from_folders([NODE_PATH, IMAGE_NODE_PATH])
+    nodes.extend(get_published_nodes_from_folder(PUBLISHED_NODE_PATH))
+    return nodes
@@ -33,4 +33,6 @@ class NodeDataTreeWidget(pg.DataTreeWidget):
                 if self.node.geo is not None:
                     self.setData(self.node.geo.getAttribNames())
             else:
-                self.setData(self.node.model.custom_properties)
+                data = dict(self.node.model.custom_properties)
+                data.update(self.node.output_data())
+                self.setData(data)
@@ -4,7 +4,10 @@ from Qt.QtCore import Qt, QSettings
 from ..vendor.NodeGraphQt import NodeGraph, NodeTreeWidget
 from ..vendor.NodeGraphQt.widgets.file_dialog import messageBox
 from ..vendor.NodeGraphQt.base import utils
-from ..base.node import RootNode, update_nodes
+from ..base.node import RootNode, CookWorker, FramePrefetcher
+from ..base.kernels import warm_up_kernels
+from ..base.session import BINARY_SESSION_EXT, read_binary_session, write_binary_session
+from ..constants import COMPACT_SESSION
 from .styles import mainStyle
 from .geometryViewer.geometryViewer import GeometryViewer
 from .timeLine import TimeLine
@@ -38,6 +41,11 @@ class mainWindow(QMainWindow):
         self.graph.show_node_info_panel_triggerd.connect(self.show_node_info_panel)
         self.graph.close_node_info_panel_triggered.connect(self.close_node_info_panel)
         self.graph.master = self
+        self.cook_worker = CookWorker(self)
+        self.cook_worker.finished.connect(self.on_cook_finished)
+        self.graph.cook_worker = self.cook_worker
+        self.graph.compact_session = COMPACT_SESSION
+        self.graph.session_formats[BINARY_SESSION_EXT] = (read_binary_session, write_binary_session)
         self.graph.add_node(RootNode())
         self.graph.undo_stack().clear()
 
@@ -52,6 +60,8 @@ class mainWindow(QMainWindow):
 
         self.timeline = TimeLine()
         self.timeline.setFps(25)
+        self.prefetcher = FramePrefetcher(self.graph, self.timeline, self.cook_worker)
+        warm_up_kernels()
         self.setCentralWidget(self.timeline)
 
         self.nodeInfoPanel = NodeInfoPanel()
@@ -134,6 +144,7 @@ class mainWindow(QMainWindow):
             self.settings.setValue("geometry", self.saveGeometry())
             self.settings.setValue("windowState", self.saveState())
             event.accept()
+            self.cook_worker.stop()
             self.closed.emit()
         else:
             event.ignore()
@@ -174,4 +185,8 @@ class mainWindow(QMainWindow):
         self.nodeInfoPanel.close()
 
     def cook_graph_nodes(self):
-        update_nodes(self.graph.root_node().children())
\ No newline at end of file
+        self.cook_worker.request(all_nodes=self.graph.root_node().children())
+
+    def on_cook_finished(self, scheduler):
+        self.message('cook time: {:.3f}s, critical path: {:.3f}s ({} nodes)'.format(
+            scheduler.total_time, scheduler.critical_path_time, len(scheduler.critical_path)))
\ No newline at end of file
@@ -1,5 +1,6 @@
 from Qt import QtGui, QtWidgets
-from ..base.node import AutoNode, GeometryNode, SubGraphNode, ImageNode
+from ..base.node import AutoNode, GeometryNode, SubGraphNode, ImageNode, tracer, frame_cache, disk_cache
+from ..base.session import BINARY_SESSION_EXT
 from ..vendor.NodeGraphQt import NodePublishWidget
 from ..vendor.NodeGraphQt.base import utils
 from ..vendor.NodeGraphQt.constants import (PIPE_LAYOUT_ANGLE, PIPE_LAYOUT_STRAIGHT,
@@ -65,6 +66,36 @@ def draw_node(graph):
         graph.master.imageViewer.set_node(node)
 
 
+def start_cook_trace(graph):
+    tracer.start()
+    graph.master.message('cook trace started')
+
+
+def save_cook_trace(graph):
+    tracer.stop()
+    file_path = graph.save_dialog()
+    if file_path:
+        tracer.save(file_path)
+        graph.master.message('cook trace saved to {}'.format(file_path))
+
+
+def clear_frame_cache(graph):
+    size = frame_cache.size()
+    frame_cache.clear()
+    graph.master.message('frame cache cleared, {:.1f} MB released'.format(size / 1048576.0))
+
+
+def clear_disk_cache(graph):
+    disk_cache.clear()
+    graph.master.message('disk cache cleared')
+
+
+def save_binary_session_as(graph):
+    file_path = graph.viewer().save_dialog(graph.current_session(), BINARY_SESSION_EXT[1:])
+    if file_path:
+        graph.save_session(file_path)
+
+
 def add_command(menu, name, func=None, parent=None, shortcut=None):
     action = QtWidgets.QAction(name, parent)
     if shortcut:
@@ -87,6 +118,7 @@ def setup_menu_bar(graph, window, root_menu):
     add_command(file_menu, 'Import...', lambda: utils._import_session(graph), window)
     add_command(file_menu, 'Save...', lambda: utils._save_session(graph), window, QtGui.QKeySequence.Save)
     add_command(file_menu, 'Save As...', lambda: utils._save_session_as(graph), window, 'Ctrl+Shift+S')
+    add_command(file_menu, 'Save Binary Session As...', lambda: save_binary_session_as(graph), window)
     add_command(file_menu, 'New Session', lambda: utils._new_session(graph), window)
     add_command(file_menu, 'Close', window.close, window)
 
@@ -143,6 +175,11 @@ def setup_menu_bar(graph, window, root_menu):
     add_command(pipe_menu, 'Dots', lambda: graph.set_grid_mode(VIEWER_GRID_DOTS), view)
     graph_menu.addSeparator()
     add_command(graph_menu, 'Draw Node', lambda: draw_node(graph), view, 'S')
+    graph_menu.addSeparator()
+    add_command(graph_menu, 'Start Cook Trace', lambda: start_cook_trace(graph), view)
+    add_command(graph_menu, 'Save Cook Trace...', lambda: save_cook_trace(graph), view)
+    add_command(graph_menu, 'Clear Frame Cache', lambda: clear_frame_cache(graph), view)
+    add_command(graph_menu, 'Clear Disk Cache', lambda: clear_disk_cache(graph), view)
 
     # Node Menu
     node_menu = graph.context_nodes_menu()
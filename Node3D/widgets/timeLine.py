@@ -108,7 +108,16 @@ class TimeLine(QtWidgets.QWidget):
         return self.slider.value()
 
     def getTime(self):
-        return float(self.slider.value())/self.fps
+        return float(self.getFrame())/self.fps
+
+    def getFrameRange(self):
+        return self.startValue.value(), self.endValue.value()
+
+    def isPlaying(self):
+        return self.timeline.state() == QtCore.QTimeLine.Running
+
+    def isForward(self):
+        return self.timeline.direction() == QtCore.QTimeLine.Forward
 
     def setForward(self):
         self.timeline.setDirection(QtCore.QTimeLine.Forward)
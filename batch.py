@@ -0,0 +1,80 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import sys
+import argparse
+
+from PySide2 import QtCore
+from Node3D.vendor.NodeGraphQt import BackdropNode
+from Node3D.base.headless import HeadlessGraph
+from Node3D.base.node import tracer
+from Node3D.registry import get_default_nodes
+from Node3D.constants import COOK_THREAD_COUNT
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Cook a Node3D session without the main window.')
+    parser.add_argument('session', help='session file saved by Node3D.')
+    parser.add_argument('-n', '--nodes', nargs='+', default=None,
+                        help='names or paths of the nodes to cook, cook the whole graph by default.')
+    parser.add_argument('-f', '--frames', nargs=2, type=int, default=None, metavar=('START', 'END'),
+                        help='frame range to cook.')
+    parser.add_argument('-s', '--step', type=int, default=1, help='frame step.')
+    parser.add_argument('--fps', type=int, default=25, help='frames per second.')
+    parser.add_argument('-t', '--threads', type=int, default=COOK_THREAD_COUNT, help='cook thread count.')
+    parser.add_argument('--trace', default=None, help='save the cook trace as a Chrome trace event file.')
+    return parser.parse_args(argv)
+
+
+def report(frame, scheduler):
+    print('frame {}: {} nodes cooked in {:.3f}s, critical path {:.3f}s'.format(
+        frame, len(scheduler.cook_times), scheduler.total_time, scheduler.critical_path_time))
+    for node in scheduler.failed_nodes:
+        print('  {} : {}'.format(node.path(), node.get_message()[0] or 'up stream node failed'))
+    return not scheduler.failed_nodes
+
+
+def run(argv=None):
+    args = parse_args(argv)
+    # the nodes are created without views, a core application is enough.
+    app = QtCore.QCoreApplication(sys.argv[:1])
+
+    BackdropNode.__identifier__ = 'Utility'
+    BackdropNode.NODE_CATEGORY = None
+    nodes = get_default_nodes()
+    nodes.append(BackdropNode)
+
+    graph = HeadlessGraph(nodes)
+    graph.timeline.setFps(args.fps)
+    graph.load_session(args.session)
+
+    targets = None
+    if args.nodes:
+        targets = []
+        for name in args.nodes:
+            node = graph.get_node_by_name(name)
+            if node is None:
+                print('Cannot find node: "{}"'.format(name))
+                return 1
+            targets.append(node)
+
+    if args.trace:
+        tracer.start()
+
+    success = True
+    if args.frames:
+        start, end = args.frames
+        for frame, scheduler in graph.cook_frames(start, end, targets, args.step, args.threads):
+            success = report(frame, scheduler) and success
+    else:
+        success = report(graph.timeline.getFrame(), graph.cook(targets, args.threads))
+
+    if args.trace:
+        tracer.stop()
+        tracer.save(args.trace)
+
+    app.quit()
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run())
@@ -0,0 +1,45 @@
+import importlib
+import os
+import re
+
+import pytest
+
+pytest.importorskip('numpy')
+numba = pytest.importorskip('numba')
+pytest.importorskip('openmesh')
+pytest.importorskip('OpenGL')
+pytest.importorskip('Qt')
+
+from Node3D.base.kernels import warm_up_kernels
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Node3D')
+JIT_PATTERN = re.compile(r'^@(numba\.)?n?jit\b', re.MULTILINE)
+
+
+def _kernel_modules():
+    for root, dirs, files in os.walk(PACKAGE_PATH):
+        dirs[:] = [d for d in dirs if d not in ('vendor', '__pycache__')]
+        for file_name in files:
+            if not file_name.endswith('.py'):
+                continue
+            file_path = os.path.join(root, file_name)
+            with open(file_path, encoding='utf-8') as f:
+                if not JIT_PATTERN.search(f.read()):
+                    continue
+            rel_path = os.path.relpath(file_path, os.path.dirname(PACKAGE_PATH))
+            yield os.path.splitext(rel_path)[0].replace(os.sep, '.')
+
+
+def test_warm_up_compiles_every_kernel():
+    dispatchers = []
+    for module_name in _kernel_modules():
+        module = importlib.import_module(module_name)
+        for name, obj in vars(module).items():
+            if isinstance(obj, numba.core.dispatcher.Dispatcher) and obj.py_func.__module__ == module_name:
+                dispatchers.append((module_name, name, obj))
+    assert dispatchers
+
+    warm_up_kernels(background=False)
+
+    missing = ['{}.{}'.format(module_name, name) for module_name, name, obj in dispatchers if not obj.signatures]
+    assert not missing
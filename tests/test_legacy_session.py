@@ -0,0 +1,22 @@
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('numba')
+pytest.importorskip('openmesh')
+pytest.importorskip('Qt')
+
+from Node3D.base.headless import HeadlessGraph
+from Node3D.nodes.math_nodes import Sin, VectorSplit
+
+
+def test_legacy_output_properties_are_dropped():
+    graph = HeadlessGraph([Sin, VectorSplit])
+    data = {'nodes': {
+        '0x1': {'type_': Sin.type_, 'name': 'Sin', 'custom': {'out': [0.0, 1.0]}},
+        '0x2': {'type_': VectorSplit.type_, 'name': 'VectorSplit', 'custom': {'x': 1.0, 'y': 2.0}},
+    }}
+    sin, split = graph._deserialize(data)
+
+    assert not sin.has_property('out')
+    assert not split.has_property('x')
+    assert not split.has_property('y')
@@ -0,0 +1,56 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('openmesh')
+pytest.importorskip('OpenGL')
+pytest.importorskip('Qt')
+
+from Node3D.opengl.Mesh import Mesh
+
+
+def _quad():
+    mesh = Mesh()
+    mesh.addVertices(np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float64))
+    mesh.addFaces(np.array([[0, 1, 2, 3]]))
+    mesh.setVertexAttribData('color', np.zeros((4, 3)), 'vector3', [0, 0, 0])
+    return mesh
+
+
+def test_shallow_copy_detaches_only_written_attribute():
+    source = _quad()
+    mesh = source.shallowCopy()
+
+    mesh.setVertexAttribData('color', np.ones((4, 3)))
+    mesh.setVertexAttrib('pos', 0, np.array([2.0, 2.0, 2.0]))
+
+    # the openmesh data is still shared, only the written attributes are copied.
+    assert mesh.isShared()
+    assert mesh._mesh is source._mesh
+    assert np.all(source.getVertexAttribData('color') == 0)
+    assert np.all(mesh.getVertexAttribData('color') == 1)
+    assert np.all(source.getVertexAttribData('pos')[0] == 0)
+    assert np.all(mesh.getVertexAttribData('pos')[0] == 2)
+
+
+def test_shared_positions_are_read_only():
+    source = _quad()
+    mesh = source.shallowCopy()
+
+    points = mesh.getVertexAttribData('pos')
+    assert mesh.isShared()
+    with pytest.raises(ValueError):
+        points[0] = 1.0
+
+
+def test_topology_change_keeps_written_attributes():
+    source = _quad()
+    mesh = source.shallowCopy()
+    mesh.setVertexAttribData('color', np.ones((4, 3)))
+
+    mesh.addVertex([5.0, 5.0, 5.0])
+
+    assert not mesh.isShared()
+    assert mesh._mesh is not source._mesh
+    assert np.all(mesh.getVertexAttribData('color')[:4] == 1)
+    assert source.getNumVertexes() == 4
+    assert np.all(source.getVertexAttribData('color') == 0)
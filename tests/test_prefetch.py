@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('numba')
+pytest.importorskip('openmesh')
+pytest.importorskip('Qt')
+
+from Node3D.base.headless import HeadlessGraph
+from Node3D.base.node import frame_cache
+from Node3D.base.node.cook_worker import CookWorker, _PrefetchScheduler
+from Node3D.nodes.script_nodes import Python
+
+SCRIPT = "node.geo.setDetailAttrib('frame', node.get_frame(), 'int')"
+
+
+def test_prefetch_depend_time_python_node():
+    graph = HeadlessGraph([Python])
+    node = Python()
+    graph.add_node(node)
+    # the node is only cooked by the prefetch.
+    graph._auto_update = False
+    node.set_property('Script', SCRIPT)
+    node.set_property('Depend Time', True)
+    frame_cache.clear()
+
+    frames = [1, 2, 3]
+    for frame in frames:
+        scheduler = _PrefetchScheduler(frame)
+        scheduler.run(CookWorker._prefetch_order([node]))
+        assert not scheduler.failed_nodes
+
+    assert frame_cache.frames(node) == frames
+    # the node at the play head is left unchanged.
+    assert node._geo is None
+    assert node.namespace['node'] is node
+    for frame in frames:
+        graph.timeline.frame = frame
+        data = frame_cache.get(node.compute_cache_key())
+        assert data is not None
+        assert data['geo'].getDetailAttrib('frame') == frame
@@ -0,0 +1,34 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('openmesh')
+pytest.importorskip('Qt')
+
+from Node3D.base.session import _encode_properties, _decode_properties
+
+CUSTOM = {
+    'Gradient': [[[0.0, 0.0, 0.0, 1.0], [1.0, 1.0, 1.0, 1.0]], [0, 1], 'linear'],
+    'Curve': [[[0, 0], [1, 1]], 'quadratic'],
+    'Matrix': [[1.0, 0.0], [0.0, 1.0]],
+    'Vector': [1.0, 2.0, 3.0],
+    'Name': 'box',
+}
+
+
+def test_nested_and_ramp_properties_are_arrays():
+    data = {'nodes': {'0x1': {'custom': dict(CUSTOM)}}}
+    arrays = {}
+    _encode_properties(data, arrays)
+
+    custom = data['nodes']['0x1']['custom']
+    assert '__array__' in custom['Matrix']
+    assert '__array__' in custom['Gradient'][0]
+    assert '__array__' in custom['Gradient'][1]
+    assert custom['Gradient'][2] == 'linear'
+    assert '__array__' in custom['Curve'][0]
+    # short flat lists such as vectors are kept in JSON.
+    assert custom['Vector'] == [1.0, 2.0, 3.0]
+    assert len(arrays) == 4
+
+    _decode_properties(data, arrays)
+    assert data['nodes']['0x1']['custom'] == CUSTOM
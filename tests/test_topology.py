@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('numba')
+pytest.importorskip('openmesh')
+pytest.importorskip('Qt')
+
+from Node3D.base.headless import HeadlessGraph
+from Node3D.nodes.math_nodes import Sin, Add
+
+
+def test_deleted_port_edges_are_removed():
+    graph = HeadlessGraph([Sin, Add])
+    sin = Sin()
+    add = Add()
+    graph.add_node(sin)
+    graph.add_node(add)
+    sin.output(0).connect_to(add.input(0))
+    topology = graph.model.topology
+    assert topology.in_edges(add)
+
+    add.delete_input(0)
+
+    assert not topology.in_edges(add)
+    assert not topology.out_edges(sin)
@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('numba')
+pytest.importorskip('openmesh')
+pytest.importorskip('Qt')
+
+from Node3D.base.node.wrangle_node import _attribute_usage
+
+NAMES = ['pos', 'Cd']
+
+
+@pytest.mark.parametrize('script', [
+    'pos[idx] = pos[idx] * 2.0',
+    'pos[idx, 0] += 1.0',
+    'p = pos[idx]\np[0] = 1.0',
+])
+def test_element_writes_are_parallel(script):
+    referenced, written, scattered = _attribute_usage(script, NAMES)
+    assert written == {'pos'}
+    assert not scattered
+
+
+@pytest.mark.parametrize('script', [
+    'pos[idx + 1] = Cd[idx]',
+    'pos += 1.0',
+    'p = pos[0]\np[0] = 1.0',
+])
+def test_scattered_writes_are_serial(script):
+    referenced, written, scattered = _attribute_usage(script, NAMES)
+    assert scattered == {'pos'}